@@ -32,7 +32,7 @@ import werkzeug.serving # Need this for shutdown
 
 from .sensors import SensorManager
 from .camera import CameraManager, CameraConfig
-from .notifications import NotificationManager, create_intrusion_alert, create_rfid_alert
+from .notifications import NotificationManager, get_notification_manager, create_intrusion_alert, create_rfid_alert
 from .api_server import create_pi_api_server
 
 # Load environment variables
@@ -291,7 +291,7 @@ class ServerRoomMonitor:
             logger.info("Initializing CameraManager...")
             self.camera_manager = CameraManager(self.config.camera_config)
             logger.info("Initializing NotificationManager...")
-            self.notification_manager = NotificationManager()
+            self.notification_manager = get_notification_manager()
 
             # Start sensor monitoring threads (part of SensorManager init or a separate start method)
             if self.sensor_manager:
@@ -18,7 +18,7 @@ import time
 import random
 import platform
 from gpiozero import MotionSensor as PIRMotionSensor, Button as OpenCloseSensor, LED
-from gpiozero import InputDevice
+from gpiozero import DigitalInputDevice
 
 # Configure logging
 logging.basicConfig(
@@ -35,21 +35,21 @@ try:
     if IS_RASPBERRY_PI:
         logger.info("Running on Raspberry Pi with real GPIO hardware")
         # Import GPIOZero components only if on RPi
-        from gpiozero import MotionSensor as PIRMotionSensor, Button as OpenCloseSensor, LED, InputDevice
+        from gpiozero import MotionSensor as PIRMotionSensor, Button as OpenCloseSensor, LED, DigitalInputDevice
     else:
         logger.warning("Not running on Raspberry Pi, using mock implementation")
         # Define placeholders for type hinting if needed
         PIRMotionSensor = None
         OpenCloseSensor = None
         LED = None
-        InputDevice = None
+        DigitalInputDevice = None
 except ImportError:
     IS_RASPBERRY_PI = False
     logger.warning("Running in mock mode - GPIOZero library likely not installed or platform detection failed")
     PIRMotionSensor = None
     OpenCloseSensor = None
     LED = None
-    InputDevice = None
+    DigitalInputDevice = None
 
 @dataclass
 class SensorConfig:
@@ -140,6 +140,8 @@ class BaseSensorHandler:
 
         self.sensor = None # Placeholder for gpiozero or mock sensor object
         self.led = None    # Placeholder for gpiozero or mock LED object
+        # Called from the gpiozero callback thread when the sensor triggers; keep it short
+        self.on_trigger: Optional[Callable[[], None]] = None
 
         # Initialize LED if configured
         if config.led_pin is not None:
@@ -189,6 +191,11 @@ class BaseSensorHandler:
 
         self.logger.info(f"[{self.config.name}]: Base cleanup finished.")
 
+    def _notify_trigger(self) -> None:
+        """Pass a trigger on to the on_trigger hook, if one is set."""
+        if self.on_trigger is not None:
+            self.on_trigger()
+
     def _flash_led(self, times=1, duration=0.1):
         """Flash the associated LED briefly."""
         if self.led:
@@ -238,7 +245,7 @@ class MotionSensorHandler(BaseSensorHandler):
         # This callback only runs if IS_RASPBERRY_PI is True
         self.logger.info(f"[{self.config.name}]: Motion DETECTED")
         self._flash_led(times=2)
-        # Callback handled by SensorManager polling check_motion
+        self._notify_trigger()
 
     def on_motion_stopped(self):
         # This callback only runs if IS_RASPBERRY_PI is True
@@ -277,7 +284,7 @@ class MotionSensorHandler(BaseSensorHandler):
         self.logger.info(f"[{self.config.name}]: Motion sensor cleanup finished.")
 
 class OpenCloseSensorHandler(BaseSensorHandler):
-    """Base class for sensors using InputDevice (like reed switches)."""
+    """Base class for sensors using DigitalInputDevice (like reed switches)."""
     def __init__(self, config: SensorConfig):
         super().__init__(config)
         self._is_open = False # Internal state for consistency
@@ -287,7 +294,8 @@ class OpenCloseSensorHandler(BaseSensorHandler):
                  # Assuming pull_up=True means pin is LOW when closed (magnet near) and HIGH when open (magnet away)
                  # is_active is True if pin is HIGH (Open)
                  self._is_open = self.sensor.is_active
-                 # InputDevice doesn't have when_activated/deactivated, polling is needed
+                 self.sensor.when_activated = self._handle_opened
+                 self.sensor.when_deactivated = self._handle_closed
                  self.logger.info(f"[{config.name}]: Real Open/Close sensor initialized. Initial state: {'OPEN' if self._is_open else 'CLOSED'}")
             elif isinstance(self.sensor, MockSensor):
                  self._is_open = self.sensor.is_pressed() # Use mock sensor state
@@ -301,15 +309,27 @@ class OpenCloseSensorHandler(BaseSensorHandler):
             raise
 
     def create_sensor(self, gpio_pin: int):
-        if IS_RASPBERRY_PI and InputDevice is not None:
-            self.logger.info(f"[{self.config.name}]: Creating real InputDevice sensor on pin {gpio_pin}")
-            # Using InputDevice with pull-up
-            return InputDevice(gpio_pin, pull_up=True)
+        if IS_RASPBERRY_PI and DigitalInputDevice is not None:
+            self.logger.info(f"[{self.config.name}]: Creating real DigitalInputDevice sensor on pin {gpio_pin}")
+            # DigitalInputDevice with pull-up; unlike InputDevice it reports edges through callbacks
+            return DigitalInputDevice(gpio_pin, pull_up=True, bounce_time=0.05)
         else:
              self.logger.info(f"[{self.config.name}]: Creating MockSensor for Open/Close on pin {gpio_pin}")
              return MockSensor(gpio_pin, pull_up=True) # Use MockSensor
 
-    # Callbacks (_handle_opened, _handle_closed) are removed as InputDevice doesn't use them directly
+    def _handle_opened(self):
+        # This callback only runs if IS_RASPBERRY_PI is True
+        self._is_open = True
+        self.logger.info(f"[{self.config.name}]: OPENED")
+        self._flash_led()
+        self._notify_trigger()
+
+    def _handle_closed(self):
+        # This callback only runs if IS_RASPBERRY_PI is True
+        self._is_open = False
+        self.logger.info(f"[{self.config.name}]: CLOSED")
+        if self.led and not isinstance(self.led, MockLED):
+            self.led.off()
 
     def check_state(self) -> bool:
         """Check if the sensor is currently in the open state (True if open, False if closed)."""
@@ -341,7 +361,14 @@ class OpenCloseSensorHandler(BaseSensorHandler):
     def cleanup(self):
         """Clean up open/close sensor resources."""
         self.logger.debug(f"[{self.config.name}]: Starting open/close sensor specific cleanup...")
-        # No callbacks to detach for InputDevice
+        # Detach callbacks before closing sensor in base class
+        if IS_RASPBERRY_PI and self.sensor and not isinstance(self.sensor, MockSensor):
+            self.logger.debug(f"[{self.config.name}]: Detaching real sensor callbacks...")
+            try:
+                self.sensor.when_activated = None
+                self.sensor.when_deactivated = None
+            except Exception as e:
+                 self.logger.error(f"[{self.config.name}]: Error detaching real sensor callbacks: {e}")
         super().cleanup() # Call base class cleanup
         self.logger.info(f"[{self.config.name}]: Open/Close sensor cleanup finished.")
 
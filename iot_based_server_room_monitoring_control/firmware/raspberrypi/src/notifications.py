@@ -6,105 +6,467 @@ It integrates with the sensor and camera modules to provide comprehensive alerts
 via multiple channels (SMS, Email, FCM) when security events are detected.
 
 Dependencies:
-    - twilio (install via: pip install twilio)
-    - requests (install via: pip install requests)
-    - python-dotenv (install via: pip install python-dotenv)
+    - twilio (install via: pip install twilio) - imported on first SMS
+    - requests (install via: pip install requests) - imported on first HTTP send
+    - httpx[http2] (install via: pip install "httpx[http2]") - FCM HTTP v1 sends
+    - google-auth (install via: pip install google-auth) - FCM OAuth access tokens
+    - python-dotenv (install via: pip install python-dotenv) - only if a .env file exists
+    - orjson (optional, install via: pip install orjson) - faster JSON encoding
 """
 
+import asyncio
 import logging
 import os
+import re
+import socket
+import threading
+import queue
+import ipaddress
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from urllib.parse import urlparse
 from datetime import datetime
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
-from dotenv import load_dotenv
-from twilio.rest import Client
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Callable, Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 import smtplib
 from email.message import EmailMessage
-import requests
 import json
 import time
-import copy
+import hashlib
+
+# twilio, requests and httpx are heavy imports; load them on first use only
+if TYPE_CHECKING:
+    import httpx
+    import requests
+    from twilio.rest import Client
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-# load_dotenv() # Removed - Should be loaded once in main.py
+FCM_SEND_URL = 'https://fcm.googleapis.com/v1/projects/{project_id}/messages:send'
+ALERT_TITLE_PREFIX = "Server Room Alert: "  # Start of every SMS/email body, email subject and push title
+FCM_SCOPES = ['https://www.googleapis.com/auth/firebase.messaging']
+# (connect, read) timeouts in seconds for every HTTP call. With the retries
+# below, a dead endpoint costs at most ~31 s for a server batch (3 attempts)
+# and ~16 s for an FCM send (connect retried twice, read once).
+HTTP_TIMEOUT = (3.05, 7)
+HTTP_RETRIES = 2
+LOG_PAYLOAD_LIMIT = 2048  # Bytes of a request body included in log messages
+SEND_MAX_ATTEMPTS = 3  # Attempts per provider call when the failure is transient
+SEND_BACKOFF = 0.3  # Seconds before the first retry, doubled per attempt...
+SEND_BACKOFF_MAX = 3.0  # ...up to this cap
+BREAKER_THRESHOLD = 5  # Consecutive failed sends that open a channel's circuit
+BREAKER_COOLDOWN = 30.0  # Seconds a channel is skipped once its circuit opens
+SMS_MAX_CONCURRENT = 5  # Parallel Twilio requests, kept under the account's rate limit
+ALERT_BATCH_MAX_ITEMS = 20  # Max queued alerts dispatched together by enqueue()'s flusher
+ALERT_BATCH_MAX_WAIT = 0.25  # Seconds to wait for more alerts before dispatching a batch
+EVENT_BATCH_MAX_ITEMS = 50  # Max events per /events/batch POST
+EVENT_BATCH_MAX_WAIT = 0.2  # Seconds to wait for more events before posting a batch
+SMTP_TIMEOUT = 10  # Seconds; smtplib blocks forever by default
+SMTP_IDLE_CHECK = 60  # Seconds idle after which a reused session is probed with NOOP
+SMTP_KEEPALIVE_INTERVAL = 300  # Seconds between NOOPs; providers drop idle sessions after ~30 min
+FLUSH_POLL_INTERVAL = 0.05  # Seconds between queue checks while flush() waits with a deadline
+
+# Credential formats, compiled once at import
+_TWILIO_SID_RE = re.compile(r'^AC[0-9a-fA-F]{32}$')
+_FCM_PROJECT_RE = re.compile(r'^[a-z][a-z0-9\-]{4,28}[a-z0-9]$')
+
+# .env in the firmware project root (firmware/raspberrypi/.env)
+DEFAULT_ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
+def configure(env_file: Optional[str] = None) -> None:
+    """Load environment variables and configure logging.
+
+    Only call this from an entry point (e.g. running this module directly);
+    main.py performs its own setup, so importing this module has no side effects.
+    The .env file is only read if it exists; deployments that inject the
+    environment (systemd, docker) skip it with a single stat.
+    """
+    env_path = Path(env_file) if env_file else DEFAULT_ENV_FILE
+    if env_path.is_file():
+        from dotenv import load_dotenv
+        load_dotenv(env_path)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+def _is_public_url(url: str) -> bool:
+    """Check that a media URL is not on localhost or the LAN.
+
+    Twilio fetches MMS media itself, so the URL must be reachable from the
+    internet (e.g. the cloud storage URL returned by CameraManager).
+    """
+    host = urlparse(url).hostname
+    if not host or host == 'localhost' or host.endswith('.local'):
+        return False
+    try:
+        return ipaddress.ip_address(host).is_global
+    except ValueError:
+        return True  # A DNS name; assume it resolves publicly
+
+def _json_default(obj: Any) -> str:
+    """Encode values json can't handle natively: datetimes as ISO 8601, others as str."""
+    return obj.isoformat() if isinstance(obj, datetime) else str(obj)
+
+# orjson encodes datetimes itself; non-str keys and numpy arrays (e.g. from
+# OpenCV) are accepted to match what sensor_data may contain
+_ORJSON_OPTS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTS)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
 
-@dataclass
+# Guidance for common Twilio error codes (TwilioRestException.code)
+_TWILIO_ERROR_HINTS = {
+    21608: """
+            Twilio Trial Account Error:
+            - Your phone number is not verified
+            - Please verify your number at: https://www.twilio.com/console/phone-numbers/verified
+            - Or upgrade to a paid account to send to unverified numbers
+            """,
+    20003: """
+            Twilio Authentication Error:
+            - Invalid Account SID or Auth Token
+            - Please check your TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN
+            """,
+}
+
+# Guidance for FCM HTTP status codes
+_FCM_INVALID_CREDENTIALS = """
+                FCM Error: Invalid credentials
+                - The service account in FCM_SERVICE_ACCOUNT_FILE was rejected
+                - Make sure it belongs to FCM_PROJECT_ID and may send messages
+                """
+_FCM_ERRORS = {
+    404: """
+                FCM Error: Invalid device token
+                - The FCM_DEVICE_TOKEN is not valid or no longer registered
+                - Make sure you're using a valid token from your mobile app
+                """,
+    401: _FCM_INVALID_CREDENTIALS,
+    403: _FCM_INVALID_CREDENTIALS,
+}
+
+def _is_transient(error: Exception) -> bool:
+    """Check whether an HTTP provider error is worth retrying (rate limits, 5xx, network)."""
+    # TwilioRestException has .status; requests/httpx status errors have .response
+    status = getattr(error, 'status', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    if 'httpx' in sys.modules and isinstance(error, sys.modules['httpx'].TransportError):
+        return True
+    # Connection failures and timeouts; requests exceptions are OSErrors too
+    return isinstance(error, OSError)
+
+def _is_transient_sms(error: Exception) -> bool:
+    """Check whether a failed Twilio send is safe to retry.
+
+    Creating a message is not idempotent: a 5xx or a read timeout can come
+    back after Twilio accepted it, so only rate limits and failures to
+    connect are retried.
+    """
+    status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        return status == 429
+    if 'requests' in sys.modules and isinstance(error, sys.modules['requests'].exceptions.ReadTimeout):
+        return False
+    return isinstance(error, OSError)
+
+def _is_transient_email(error: Exception) -> bool:
+    """Check whether a failed SMTP send is safe to retry.
+
+    A timeout or dropped connection can come after the server accepted the
+    message, so only temporary (4xx) replies and failures to connect are retried.
+    """
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (ConnectionRefusedError, socket.gaierror))
+
+def _drain_batch(q: queue.Queue, max_items: int, max_wait: float) -> list:
+    """Block for one item, then collect more until max_items or max_wait elapses."""
+    batch = [q.get()]
+    deadline = time.monotonic() + max_wait
+    while len(batch) < max_items:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(q.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+@lru_cache(maxsize=256)
+def _render_alert_text(event_type: str, ts_human: str, message: str, severity: str,
+                       sensor_items: Tuple[Tuple[str, str], ...], media_url: Optional[str]) -> str:
+    """Render the text body of an alert.
+
+    Memoized on the rendered fields, so repeats of the same alert (separate
+    AlertData objects from a flapping sensor, forced resends) are formatted once.
+    """
+    sensor_block = ("\n\nSensor Data:\n" + "\n".join(f"- {key}: {value}" for key, value in sensor_items)
+                    if sensor_items else "")
+    media_block = f"\n\nMedia URL: {media_url}" if media_url else ""
+    return (f"{ALERT_TITLE_PREFIX}{event_type}\n"
+            f"Time: {ts_human}\n"
+            f"Message: {message}\n"
+            f"Severity: {severity}"
+            f"{sensor_block}{media_block}")
+
+@dataclass(frozen=True)
+class NotificationConfig:
+    """Notification settings read from the environment."""
+    twilio_sid: Optional[str] = None
+    twilio_token: Optional[str] = None
+    twilio_from: Optional[str] = None
+    twilio_to: Optional[str] = None
+    smtp_server: Optional[str] = None
+    smtp_port: int = 587
+    smtp_username: Optional[str] = None
+    smtp_password: Optional[str] = None
+    email_from: Optional[str] = None
+    email_to: Optional[str] = None
+    smtp_max_messages: int = 100
+    fcm_project_id: Optional[str] = None
+    fcm_credentials_file: Optional[str] = None
+    fcm_tokens: Tuple[str, ...] = ()
+    fcm_max_concurrent: int = 100
+    server_api_url: Optional[str] = None
+    api_key: Optional[str] = None
+    max_workers: int = 4
+    send_timeout: float = 30.0
+    debounce_s: float = 5.0
+
+@lru_cache(maxsize=None)
+def load_config() -> NotificationConfig:
+    """Read notification settings from the environment once and cache them.
+
+    Called on first use rather than at import, since entry points such as
+    main.py load their .env file after importing this module.
+    """
+    env = os.environ
+    return NotificationConfig(
+        twilio_sid=env.get("TWILIO_ACCOUNT_SID"),
+        twilio_token=env.get("TWILIO_AUTH_TOKEN"),
+        twilio_from=env.get("TWILIO_FROM_NUMBER"),
+        twilio_to=env.get("TWILIO_TO_NUMBER"),
+        smtp_server=env.get("SMTP_SERVER"),
+        smtp_port=int(env.get("SMTP_PORT", "587")),
+        smtp_username=env.get("SMTP_USERNAME"),
+        smtp_password=env.get("SMTP_PASSWORD"),
+        email_from=env.get("EMAIL_FROM"),
+        email_to=env.get("EMAIL_TO"),
+        # Reconnect after this many messages so one session doesn't live forever
+        smtp_max_messages=int(env.get("SMTP_MAX_MESSAGES_PER_CONNECTION", "100")),
+        fcm_project_id=env.get("FCM_PROJECT_ID"),
+        fcm_credentials_file=env.get("FCM_SERVICE_ACCOUNT_FILE") or env.get("GOOGLE_APPLICATION_CREDENTIALS"),
+        # FCM_DEVICE_TOKEN may hold a comma-separated list of device tokens
+        fcm_tokens=tuple(t.strip() for t in env.get("FCM_DEVICE_TOKEN", "").split(",") if t.strip()),
+        fcm_max_concurrent=int(env.get("FCM_MAX_CONCURRENT", "100")),
+        server_api_url=env.get("SERVER_API_URL"),
+        api_key=env.get("RASPBERRY_PI_API_KEY"),
+        max_workers=int(env.get("NOTIFICATION_MAX_WORKERS", "4")),
+        send_timeout=float(env.get("NOTIFICATION_SEND_TIMEOUT", "30")),
+        debounce_s=float(env.get("NOTIFICATION_DEBOUNCE_SECONDS", "5")),
+    )
+
+@dataclass(slots=True)
 class AlertData:
-    """Data structure for alert information."""
+    """Data structure for alert information.
+
+    media_url should be a public URL (e.g. from cloud storage) rather than a
+    file served by the Pi, so providers do not download it over the Pi's uplink.
+    Slotted, since one is created per event and many may sit in the alert queue.
+    """
     event_type: str
     message: str
     timestamp: datetime
     media_url: Optional[str] = None
     sensor_data: Optional[Dict[str, Any]] = None
     severity: str = "error"
+    # Timestamp renderings, computed once since every channel needs one of them
+    ts_iso: str = field(init=False, repr=False, compare=False)
+    ts_human: str = field(init=False, repr=False, compare=False)
+    # Formatted text, cached by NotificationManager._format_message
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.ts_iso = self.timestamp.isoformat()
+        self.ts_human = f"{self.timestamp:%Y-%m-%d %H:%M:%S}"
 
 class NotificationManager:
     """Manages notification channels and alert handling."""
 
-    def __init__(self):
+    def __init__(self, config: Optional[NotificationConfig] = None):
         """Initialize notification channels and configurations."""
-        self._setup_twilio()
-        self._setup_email()
-        self._setup_fcm()
-        self._setup_server_api()
+        self.config = cfg = config or load_config()
+        self.twilio_configured = self._setup_twilio()
+        self.email_configured = self._setup_email()
+        self.fcm_configured = self._setup_fcm()
+        self.server_api_configured = self._setup_server_api()
+        # Fixed sender/recipient parameters, copied into each message
+        self._sms_base = {"from_": cfg.twilio_from, "to": cfg.twilio_to}
+        self._is_gmail = "gmail" in (cfg.smtp_server or "").lower()
+        # Pre-serialized '{"message":{"token":...,' head of each device's request body;
+        # only the alert-specific content is serialized per alert
+        self._fcm_heads = [b'{"message":{"token":' + _dumps(t) + b',' for t in cfg.fcm_tokens]
+        self.fcm_url = FCM_SEND_URL.format(project_id=cfg.fcm_project_id)
+        # Service account credentials, loaded and refreshed on first send
+        self._fcm_credentials = None
+        # Request headers, rebuilt only when the access token is refreshed
+        self._fcm_headers: Dict[str, str] = {}
+        # Caps in-flight FCM requests so concurrent senders don't trip FCM throttling
+        self._fcm_sem = threading.BoundedSemaphore(cfg.fcm_max_concurrent)
+        self.server_events_endpoint = (cfg.server_api_url or "").rstrip('/') + "/events"
+        self.server_batch_endpoint = self.server_events_endpoint + "/batch"
+        # Content-Type is set on the session; only the API key is per-request
+        self._server_headers = {'X-API-Key': cfg.api_key}
+        # Channel senders share the (alert, body) signature; unconfigured channels
+        # are dropped here once instead of warning on every alert
+        self._dispatch = {'sms': self._send_sms, 'email': self._send_email, 'fcm': self._send_fcm}
+        self._active_channels = tuple(
+            channel for channel, configured in (('sms', self.twilio_configured),
+                                                ('email', self.email_configured),
+                                                ('fcm', self.fcm_configured))
+            if configured)
+        # Per-thread clients: sensor threads send alerts concurrently, and
+        # neither Twilio clients nor requests sessions are safe to share across threads
+        self._tls = threading.local()
+        # One logged-in SMTP session shared by all threads, serialized by a lock
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_sent = 0
+        self._smtp_last_used = 0.0
+        self._smtp_lock = threading.Lock()
+        self._smtp_keepalive: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        # Server events are queued and posted in batches by a background worker
+        self._event_queue: "queue.Queue[bytes]" = queue.Queue()
+        if self.server_api_configured:
+            threading.Thread(target=self._event_worker, name="event-batcher", daemon=True).start()
+        # Fingerprint -> monotonic time last sent, for suppressing repeats of flapping sensors
+        self._recent: Dict[str, float] = {}
+        self._recent_lock = threading.Lock()
+        # Per-channel circuit breakers: consecutive failures and when the circuit closes again
+        self._breakers = {channel: {'fails': 0, 'open_until': 0.0} for channel in self._dispatch}
+        self._breaker_lock = threading.Lock()
+        # Alerts passed to enqueue() are dispatched in batches by a flusher thread
+        self._alert_queue: "queue.Queue[AlertData]" = queue.Queue()
+        threading.Thread(target=self._alert_worker, name="alert-batcher", daemon=True).start()
+        # Channels are independent network round trips, so they are sent in parallel.
+        # The pool is bounded so a provider outage (e.g. Twilio hanging) queues
+        # sends instead of spawning a thread per alert.
+        self._executor = ThreadPoolExecutor(max_workers=self.config.max_workers,
+                                            thread_name_prefix="notif")
+        # Separate pool for fanning out MMS within a batch; submitting those to
+        # _executor from one of its own tasks could deadlock a saturated pool
+        self._sms_executor = ThreadPoolExecutor(max_workers=SMS_MAX_CONCURRENT,
+                                                thread_name_prefix="sms")
+        # FCM requests are independent streams on one HTTP/2 connection, so a batch
+        # is posted concurrently; threads are only spawned as requests need them
+        self._fcm_executor = ThreadPoolExecutor(max_workers=cfg.fcm_max_concurrent,
+                                                thread_name_prefix="fcm")
+        # FCM shares one HTTP/2 connection across threads (httpx clients are thread-safe)
+        self._fcm_http: Optional["httpx.Client"] = None
+        self._fcm_lock = threading.Lock()
+        # A threading exit hook, not atexit: those run after concurrent.futures has
+        # already shut the executors down, and hooks registered later run first
+        threading._register_atexit(self.close)
         logger.info("Notification manager initialized")
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every enqueued alert and queued server event has been sent.
+
+        With a timeout, gives up after that many seconds, logs what is still
+        unsent and returns False.
+        """
+        if timeout is None:
+            self._alert_queue.join()
+            self._event_queue.join()
+            return True
+        deadline = time.monotonic() + timeout
+        while self._alert_queue.unfinished_tasks or self._event_queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                logger.warning("Giving up on %d unsent alert(s) and %d unsent server event(s) after %.1fs",
+                               self._alert_queue.unfinished_tasks, self._event_queue.unfinished_tasks, timeout)
+                return False
+            time.sleep(FLUSH_POLL_INTERVAL)
+        return True
+
+    def close(self) -> None:
+        """Send queued alerts and events, stop background work and log out of the SMTP server.
+
+        Queued work gets send_timeout seconds to go out, so a dead batch worker
+        or unreachable provider can't hang interpreter shutdown; sends still
+        running after that are abandoned and pending ones cancelled.
+        """
+        if self._closed.is_set():  # Already closed explicitly; the exit hook calls this again
+            return
+        self.flush(self.config.send_timeout)
+        self._closed.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._sms_executor.shutdown(wait=False, cancel_futures=True)
+        self._fcm_executor.shutdown(wait=False, cancel_futures=True)
+        with self._smtp_lock:
+            self._drop_smtp(quit=True)
+
+    @staticmethod
+    def _submit(executor: ThreadPoolExecutor, fn: Callable, *args) -> Future:
+        """Run fn on executor, or inline if the executor has already been shut down.
+
+        Interpreter exit can shut the pools down while the batch worker is
+        still sending; running inline then sends the alert instead of dropping it.
+        """
+        try:
+            return executor.submit(fn, *args)
+        except RuntimeError:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
     def _validate_twilio_credentials(self, sid: str, token: str) -> bool:
         """Validate Twilio credentials format."""
-        if not sid or sid == "your-twilio-sid":
-            return False
-        if not token or len(token) < 32:  # Twilio auth tokens are typically longer
-            return False
-        return True
+        # Account SIDs are "AC" + 32 hex chars; auth tokens are at least 32 chars
+        return bool(sid and _TWILIO_SID_RE.match(sid) and token and len(token) >= 32)
 
     def _validate_email_config(self, server: str, port: int, username: str, password: str) -> bool:
         """Validate email configuration."""
-        if not server or server == "smtp.example.com":
-            return False
-        if not username or not password:
-            return False
-        if port < 1 or port > 65535:
-            return False
-        return True
+        return bool(server and server != "smtp.example.com"
+                    and username and password and 0 < port <= 65535)
 
-    def _validate_fcm_config(self, key: str, token: str) -> bool:
+    def _validate_fcm_config(self, project_id: str, credentials_file: str, token: str) -> bool:
         """Validate FCM configuration."""
-        if not key or not key.startswith("AAAA"):
-            return False
-        if not token or len(token) < 100:  # FCM tokens are typically long
-            return False
-        return True
+        # Firebase project IDs are 6-30 lowercase chars; device tokens are typically long
+        return bool(project_id and _FCM_PROJECT_RE.match(project_id)
+                    and credentials_file and os.path.isfile(credentials_file)
+                    and token and len(token) >= 100)
 
     def _handle_twilio_error(self, error: Exception) -> None:
         """Handle Twilio-specific errors and provide guidance."""
-        error_str = str(error)
-        if "21608" in error_str:
-            logger.error("""
-            Twilio Trial Account Error:
-            - Your phone number is not verified
-            - Please verify your number at: https://www.twilio.com/console/phone-numbers/verified
-            - Or upgrade to a paid account to send to unverified numbers
-            """)
-        elif "20003" in error_str:
-            logger.error("""
-            Twilio Authentication Error:
-            - Invalid Account SID or Auth Token
-            - Please check your TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN
-            """)
+        # TwilioRestException carries the numeric Twilio error code
+        hint = _TWILIO_ERROR_HINTS.get(getattr(error, 'code', None))
+        if hint:
+            logger.error(hint)
         else:
-            logger.error("Twilio error: %s", error_str)
+            logger.error("Twilio error: %s", error)
 
     def _handle_email_error(self, error: Exception) -> None:
         """Handle email-specific errors and provide guidance."""
-        error_str = str(error)
-        if "535" in error_str and "gmail" in self.smtp_server.lower():
+        auth_failed = isinstance(error, smtplib.SMTPAuthenticationError) and error.smtp_code == 535
+        if auth_failed and self._is_gmail:
             logger.error("""
             Gmail Authentication Error:
             - Username and password not accepted
@@ -115,147 +477,286 @@ class NotificationManager:
               3. Generate a new App Password for this application
               4. Use the generated password in SMTP_PASSWORD
             """)
-        elif "535" in error_str:
+        elif auth_failed:
             logger.error("""
             SMTP Authentication Error:
             - Invalid username or password
             - Please check your SMTP_USERNAME and SMTP_PASSWORD
             """)
         else:
-            logger.error("Email error: %s", error_str)
-
-    def _setup_twilio(self) -> None:
-        """Setup Twilio configuration."""
-        self.twilio_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        self.twilio_token = os.getenv("TWILIO_AUTH_TOKEN")
-        self.twilio_from = os.getenv("TWILIO_FROM_NUMBER")
-        self.twilio_to = os.getenv("TWILIO_TO_NUMBER")
-        
-        if all([self.twilio_sid, self.twilio_token, self.twilio_from, self.twilio_to]):
-            if self._validate_twilio_credentials(self.twilio_sid, self.twilio_token):
-                self.twilio_client = Client(self.twilio_sid, self.twilio_token)
+            logger.error("Email error: %s", error)
+
+    def _setup_twilio(self) -> bool:
+        """Check the Twilio settings; return True if SMS can be sent."""
+        cfg = self.config
+        if cfg.twilio_sid and cfg.twilio_token and cfg.twilio_from and cfg.twilio_to:
+            if self._validate_twilio_credentials(cfg.twilio_sid, cfg.twilio_token):
                 logger.info("Twilio SMS configured successfully")
-            else:
-                self.twilio_client = None
-                logger.warning("Invalid Twilio credentials format")
-        else:
-            self.twilio_client = None
-            missing = []
-            if not self.twilio_sid or self.twilio_sid == "your-twilio-sid": missing.append("TWILIO_ACCOUNT_SID")
-            if not self.twilio_token: missing.append("TWILIO_AUTH_TOKEN")
-            if not self.twilio_from: missing.append("TWILIO_FROM_NUMBER")
-            if not self.twilio_to: missing.append("TWILIO_TO_NUMBER")
-            logger.warning("Twilio SMS not configured. Missing or invalid environment variables: %s", ", ".join(missing))
-
-    def _setup_email(self) -> None:
-        """Setup email configuration."""
-        self.smtp_server = os.getenv("SMTP_SERVER")
-        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        self.smtp_username = os.getenv("SMTP_USERNAME")
-        self.smtp_password = os.getenv("SMTP_PASSWORD")
-        self.email_from = os.getenv("EMAIL_FROM")
-        self.email_to = os.getenv("EMAIL_TO")
-        
-        if all([self.smtp_server, self.smtp_port, self.smtp_username,
-                self.smtp_password, self.email_from, self.email_to]):
-            if self._validate_email_config(self.smtp_server, self.smtp_port, 
-                                        self.smtp_username, self.smtp_password):
-                self.email_configured = True
+                return True
+            logger.warning("Invalid Twilio credentials format")
+            return False
+        missing = []
+        if not cfg.twilio_sid or cfg.twilio_sid == "your-twilio-sid": missing.append("TWILIO_ACCOUNT_SID")
+        if not cfg.twilio_token: missing.append("TWILIO_AUTH_TOKEN")
+        if not cfg.twilio_from: missing.append("TWILIO_FROM_NUMBER")
+        if not cfg.twilio_to: missing.append("TWILIO_TO_NUMBER")
+        logger.warning("Twilio SMS not configured. Missing or invalid environment variables: %s", ", ".join(missing))
+        return False
+
+    def _setup_email(self) -> bool:
+        """Check the SMTP settings; return True if email can be sent."""
+        cfg = self.config
+        if (cfg.smtp_server and cfg.smtp_port and cfg.smtp_username
+                and cfg.smtp_password and cfg.email_from and cfg.email_to):
+            if self._validate_email_config(cfg.smtp_server, cfg.smtp_port,
+                                           cfg.smtp_username, cfg.smtp_password):
                 logger.info("Email notifications configured successfully")
-            else:
-                self.email_configured = False
-                logger.warning("Invalid email configuration format")
-        else:
-            self.email_configured = False
-            missing = []
-            if not self.smtp_server or self.smtp_server == "smtp.example.com": missing.append("SMTP_SERVER")
-            if not self.smtp_username: missing.append("SMTP_USERNAME")
-            if not self.smtp_password: missing.append("SMTP_PASSWORD")
-            if not self.email_from: missing.append("EMAIL_FROM")
-            if not self.email_to: missing.append("EMAIL_TO")
-            logger.warning("Email notifications not configured. Missing or invalid environment variables: %s", ", ".join(missing))
-
-    def _setup_fcm(self) -> None:
-        """Setup Firebase Cloud Messaging configuration."""
-        self.fcm_key = os.getenv("FCM_SERVER_KEY")
-        self.fcm_token = os.getenv("FCM_DEVICE_TOKEN")
-        
-        if all([self.fcm_key, self.fcm_token]):
-            if self._validate_fcm_config(self.fcm_key, self.fcm_token):
-                self.fcm_configured = True
+                return True
+            logger.warning("Invalid email configuration format")
+            return False
+        missing = []
+        if not cfg.smtp_server or cfg.smtp_server == "smtp.example.com": missing.append("SMTP_SERVER")
+        if not cfg.smtp_username: missing.append("SMTP_USERNAME")
+        if not cfg.smtp_password: missing.append("SMTP_PASSWORD")
+        if not cfg.email_from: missing.append("EMAIL_FROM")
+        if not cfg.email_to: missing.append("EMAIL_TO")
+        logger.warning("Email notifications not configured. Missing or invalid environment variables: %s", ", ".join(missing))
+        return False
+
+    def _setup_fcm(self) -> bool:
+        """Check the Firebase Cloud Messaging settings; return True if pushes can be sent."""
+        cfg = self.config
+        if cfg.fcm_project_id and cfg.fcm_credentials_file and cfg.fcm_tokens:
+            if all(self._validate_fcm_config(cfg.fcm_project_id, cfg.fcm_credentials_file, t)
+                   for t in cfg.fcm_tokens):
                 logger.info("FCM notifications configured successfully")
-            else:
-                self.fcm_configured = False
-                logger.warning("Invalid FCM configuration format")
-        else:
-            self.fcm_configured = False
-            missing = []
-            if not self.fcm_key or not self.fcm_key.startswith("AAAA"): missing.append("FCM_SERVER_KEY")
-            if not self.fcm_token: missing.append("FCM_DEVICE_TOKEN")
-            logger.warning("FCM notifications not configured. Missing or invalid environment variables: %s", ", ".join(missing))
-
-    def _setup_server_api(self) -> None:
-        """Setup main server API configuration."""
-        self.server_api_url = os.getenv("SERVER_API_URL")
-        self.api_key = os.getenv("RASPBERRY_PI_API_KEY")
-
-        if self.server_api_url and self.api_key:
-            if not self.server_api_url.startswith("http"):
+                return True
+            logger.warning("Invalid FCM configuration format")
+            return False
+        missing = []
+        if not cfg.fcm_project_id: missing.append("FCM_PROJECT_ID")
+        if not cfg.fcm_credentials_file: missing.append("FCM_SERVICE_ACCOUNT_FILE")
+        if not cfg.fcm_tokens: missing.append("FCM_DEVICE_TOKEN")
+        logger.warning("FCM notifications not configured. Missing or invalid environment variables: %s", ", ".join(missing))
+        return False
+
+    def _setup_server_api(self) -> bool:
+        """Check the main server API settings; return True if events can be reported."""
+        cfg = self.config
+        if cfg.server_api_url and cfg.api_key:
+            if not cfg.server_api_url.startswith("http"):
                 logger.warning("Invalid SERVER_API_URL format. Should start with http or https.")
-                self.server_api_configured = False
-            elif not self.api_key or len(self.api_key) < 10:
+                return False
+            if len(cfg.api_key) < 10:
                 logger.warning("RASPBERRY_PI_API_KEY seems invalid or too short.")
-                self.server_api_configured = False
-            else:
-                self.server_api_configured = True
-                self.server_events_endpoint = self.server_api_url.rstrip('/') + "/events"
-                logger.info("Server API event reporting configured successfully to %s", self.server_events_endpoint)
-        else:
-            self.server_api_configured = False
-            missing = []
-            if not self.server_api_url: missing.append("SERVER_API_URL")
-            if not self.api_key: missing.append("RASPBERRY_PI_API_KEY")
-            logger.warning("Server API event reporting not configured. Missing environment variables: %s", ", ".join(missing))
-
-    def _send_sms(self, alert: AlertData) -> Optional[str]:
-        """Send SMS alert via Twilio."""
-        if not self.twilio_client:
+                return False
+            logger.info("Server API event reporting configured successfully to %s", cfg.server_api_url)
+            return True
+        missing = []
+        if not cfg.server_api_url: missing.append("SERVER_API_URL")
+        if not cfg.api_key: missing.append("RASPBERRY_PI_API_KEY")
+        logger.warning("Server API event reporting not configured. Missing environment variables: %s", ", ".join(missing))
+        return False
+
+    def _get_twilio(self) -> "Client":
+        """Return this thread's Twilio client, creating it on first use."""
+        client = getattr(self._tls, 'twilio', None)
+        if client is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            from twilio.http.http_client import TwilioHttpClient
+            from twilio.rest import Client
+            # A pooled session keeps the TLS connection to api.twilio.com alive between alerts.
+            # POST is not in Retry's default allowed_methods, so only failed connects are
+            # retried and a message is never sent twice.
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                                  max_retries=Retry(total=2, backoff_factor=0.2)))
+            http_client = TwilioHttpClient(pool_connections=True, timeout=HTTP_TIMEOUT[1])
+            http_client.session = session
+            client = self._tls.twilio = Client(self.config.twilio_sid, self.config.twilio_token,
+                                               http_client=http_client)
+        return client
+
+    def _open_smtp(self) -> smtplib.SMTP:
+        """Open a new SMTP connection and log in."""
+        smtp = smtplib.SMTP(self.config.smtp_server, self.config.smtp_port, timeout=SMTP_TIMEOUT)
+        try:
+            smtp.starttls()
+            smtp.login(self.config.smtp_username, self.config.smtp_password)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp_sent = 0
+        if self._smtp_keepalive is None:
+            self._smtp_keepalive = threading.Thread(
+                target=self._smtp_keepalive_loop, name="smtp-keepalive", daemon=True)
+            self._smtp_keepalive.start()
+        return smtp
+
+    def _drop_smtp(self, quit: bool = False) -> None:
+        """Discard the SMTP connection so the next send reconnects.
+
+        Callers must hold _smtp_lock.
+        """
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit() if quit else smtp.close()
+            except Exception:
+                pass
+
+    def _send_smtp(self, msg: EmailMessage) -> None:
+        """Send a message over the shared SMTP connection.
+
+        The session is opened on first use and reused afterwards. A session
+        idle for more than SMTP_IDLE_CHECK is probed with NOOP first, so a
+        silently dropped connection is replaced before the send. It is also
+        reopened after smtp_max_messages, and dropped if a send fails, so the
+        next send reconnects; retrying is left to the caller.
+        """
+        with self._smtp_lock:
+            if self._smtp is not None and self._smtp_sent >= self.config.smtp_max_messages:
+                self._drop_smtp(quit=True)
+            elif self._smtp is not None and time.monotonic() - self._smtp_last_used > SMTP_IDLE_CHECK:
+                try:
+                    self._smtp.noop()
+                except (smtplib.SMTPException, OSError):
+                    self._drop_smtp()
+            if self._smtp is None:
+                self._smtp = self._open_smtp()
+            try:
+                self._smtp.send_message(msg)
+            except Exception:
+                self._drop_smtp()
+                raise
+            self._smtp_sent += 1
+            self._smtp_last_used = time.monotonic()
+
+    def _smtp_keepalive_loop(self) -> None:
+        """Send NOOP periodically so the idle SMTP session is not dropped."""
+        while not self._closed.wait(SMTP_KEEPALIVE_INTERVAL):
+            with self._smtp_lock:
+                if self._smtp is None:
+                    continue
+                try:
+                    self._smtp.noop()
+                    self._smtp_last_used = time.monotonic()
+                except Exception as e:
+                    logger.debug("SMTP keepalive failed, will reconnect on next send: %s", e)
+                    self._drop_smtp()
+
+    def _get_http_session(self) -> "requests.Session":
+        """Return this thread's pooled HTTP session, creating it on first use.
+
+        Keep-alive connections are reused across alerts, so only the first
+        POST from a thread pays for the TCP and TLS handshake.
+        """
+        session = getattr(self._tls, 'http', None)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            session = requests.Session()
+            # Gateway errors mean the event never reached the API, so POSTs are safe to retry
+            retry = Retry(total=HTTP_RETRIES, connect=HTTP_RETRIES, read=1, backoff_factor=0.3,
+                          status_forcelist=[502, 503, 504],
+                          allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'},
+                          raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({'Content-Type': 'application/json'})
+            self._tls.http = session
+        return session
+
+    def _get_fcm_http(self) -> "httpx.Client":
+        """Return the shared HTTP/2 client for FCM, creating it on first use."""
+        if self._fcm_http is None:
+            with self._fcm_lock:
+                if self._fcm_http is None:
+                    import httpx
+                    connect_timeout, read_timeout = HTTP_TIMEOUT
+                    # The transport retries failed connects only; a request that
+                    # reached FCM is never sent twice
+                    self._fcm_http = httpx.Client(
+                        transport=httpx.HTTPTransport(
+                            http2=True, retries=HTTP_RETRIES,
+                            # HTTP/2 multiplexes concurrent sends over one socket,
+                            # so only a few idle connections need to be kept open
+                            limits=httpx.Limits(max_keepalive_connections=4)),
+                        timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+        return self._fcm_http
+
+    def _fcm_request_headers(self) -> Dict[str, str]:
+        """Return FCM request headers carrying a valid access token.
+
+        The dict is only rebuilt when the token changes; httpx does not
+        mutate it, so it is shared by every request in between.
+        """
+        token = self._fcm_access_token()
+        headers = self._fcm_headers
+        if headers.get('Authorization') != f'Bearer {token}':
+            headers = self._fcm_headers = {
+                'Content-Type': 'application/json',
+                'Authorization': f'Bearer {token}',
+            }
+        return headers
+
+    def _fcm_access_token(self) -> str:
+        """Return a valid OAuth 2.0 access token for the FCM v1 API.
+
+        Tokens last about an hour; they are cached and only refreshed once
+        expired, so a burst of alerts costs a single token exchange.
+        """
+        with self._fcm_lock:
+            if self._fcm_credentials is None:
+                from google.oauth2 import service_account
+                self._fcm_credentials = service_account.Credentials.from_service_account_file(
+                    self.config.fcm_credentials_file, scopes=FCM_SCOPES)
+            if not self._fcm_credentials.valid:
+                from google.auth.transport.requests import Request
+                self._fcm_credentials.refresh(Request())
+            return self._fcm_credentials.token
+
+    def _send_sms(self, alert: AlertData, body: Optional[str] = None) -> Optional[str]:
+        """Send SMS alert via Twilio, using a pre-formatted body if given."""
+        if not self.twilio_configured:
             logger.warning("SMS alert skipped - Twilio not configured")
             return None
 
         try:
-            msg_params = {
-                "body": self._format_message(alert),
-                "from_": self.twilio_from,
-                "to": self.twilio_to
-            }
+            msg_params = {**self._sms_base,
+                          "body": body if body is not None else self._format_message(alert)}
             if alert.media_url:
-                msg_params["media_url"] = [alert.media_url]
+                if _is_public_url(alert.media_url):
+                    msg_params["media_url"] = [alert.media_url]
+                else:
+                    logger.warning("Not attaching media to SMS - %s is not publicly reachable", alert.media_url)
 
-            sent_msg = self.twilio_client.messages.create(**msg_params)
+            sent_msg = self._with_retry(self._get_twilio().messages.create,
+                                        retryable=_is_transient_sms, **msg_params)
             logger.info("SMS alert sent successfully: %s", sent_msg.sid)
             return sent_msg.sid
         except Exception as e:
             self._handle_twilio_error(e)
             return None
 
-    def _send_email(self, alert: AlertData) -> bool:
-        """Send email alert via SMTP."""
+    def _send_email(self, alert: AlertData, body: Optional[str] = None) -> bool:
+        """Send email alert via SMTP, using a pre-formatted body if given."""
         if not self.email_configured:
             logger.warning("Email alert skipped - Email not configured")
             return False
 
         try:
             msg = EmailMessage()
-            msg.set_content(self._format_message(alert))
-            msg["Subject"] = f"Server Room Alert: {alert.event_type}"
-            msg["From"] = self.email_from
-            msg["To"] = self.email_to
+            msg.set_content(body if body is not None else self._format_message(alert))
+            msg["Subject"] = ALERT_TITLE_PREFIX + alert.event_type
+            msg["From"] = self.config.email_from
+            msg["To"] = self.config.email_to
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
+            self._with_retry(self._send_smtp, msg, retryable=_is_transient_email)
 
             logger.info("Email alert sent successfully")
             return True
@@ -263,180 +764,479 @@ class NotificationManager:
             self._handle_email_error(e)
             return False
 
-    def _send_fcm(self, alert: AlertData) -> bool:
-        """Send push notification via Firebase Cloud Messaging."""
+    def _send_fcm(self, alert: AlertData, body: Optional[str] = None) -> bool:
+        """Send push notification via Firebase Cloud Messaging.
+
+        body is accepted for a uniform sender signature but unused; pushes
+        carry the short alert.message instead of the full text.
+        """
         if not self.fcm_configured:
             logger.warning("""
             FCM alert skipped - FCM not configured
             To configure FCM:
             1. Create a Firebase project
-            2. Get the Server Key from Project Settings > Cloud Messaging
+            2. Create a service account key in Project Settings > Service accounts
             3. Get the Device Token from your mobile app
-            4. Set FCM_SERVER_KEY and FCM_DEVICE_TOKEN environment variables
+            4. Set FCM_PROJECT_ID, FCM_SERVICE_ACCOUNT_FILE and FCM_DEVICE_TOKEN
+               environment variables
             """)
             return False
 
-        try:
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'key={self.fcm_key}',
-            }
-            payload = {
-                'to': self.fcm_token,
-                'notification': {
-                    'title': f"Server Room Alert: {alert.event_type}",
-                    'body': alert.message,
-                },
-                'data': {
-                    'event_type': alert.event_type,
-                    'severity': alert.severity,
-                    'timestamp': alert.timestamp.isoformat(),
-                    'media_url': alert.media_url or '',
-                }
+        if len(self.config.fcm_tokens) > 1:
+            return self._send_fcm_multicast(alert, self.config.fcm_tokens)
+
+        return self._post_fcm(self._fcm_body(self._fcm_heads[0], _dumps(self._fcm_content(alert))))
+
+    def _send_fcm_multicast(self, alert: AlertData, tokens: Tuple[str, ...]) -> bool:
+        """Send one push notification to many devices.
+
+        The v1 API takes a single token per message; the requests are
+        multiplexed over the shared HTTP/2 connection instead.
+        """
+        content = _dumps(self._fcm_content(alert))
+        delivered = self._post_fcm_all([self._fcm_body(head, content) for head in self._fcm_heads])
+        if delivered < len(tokens):
+            logger.warning("FCM multicast delivered to %d of %d devices", delivered, len(tokens))
+            return False
+        return True
+
+    def _fcm_content(self, alert: AlertData) -> Dict[str, Any]:
+        """Build the alert-specific part of an FCM payload."""
+        return {
+            'notification': {
+                'title': ALERT_TITLE_PREFIX + alert.event_type,
+                'body': alert.message,
+            },
+            'data': {
+                'event_type': alert.event_type,
+                'severity': alert.severity,
+                'timestamp': alert.ts_iso,
+                'media_url': alert.media_url or '',
             }
-            response = requests.post(
-                'https://fcm.googleapis.com/fcm/send',
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
+        }
+
+    @staticmethod
+    def _fcm_body(head: bytes, content: bytes) -> bytes:
+        """Splice serialized alert content into a device's request body."""
+        # content is a JSON object; its fields continue the message object opened by head
+        return head + content[1:] + b'}'
+
+    def _post_fcm_all(self, bodies: List[bytes]) -> int:
+        """POST serialized messages to FCM concurrently and return how many were delivered."""
+        if len(bodies) == 1:
+            return int(self._post_fcm(bodies[0]))
+        futures = [self._submit(self._fcm_executor, self._post_fcm, body) for body in bodies]
+        return sum(future.result() for future in futures)
+
+    def _post_fcm(self, body: bytes) -> bool:
+        """POST a serialized message to FCM and report any failure."""
+        with self._fcm_sem:
+            return self._post_fcm_unbounded(body)
+
+    def _post_fcm_unbounded(self, body: bytes) -> bool:
+        """POST a serialized message to FCM without taking the concurrency semaphore."""
+        import httpx
+        try:
+            self._with_retry(self._post_fcm_once, body)
             logger.info("FCM alert sent successfully")
             return True
-        except requests.exceptions.RequestException as e:
-            if e.response and e.response.status_code == 404:
-                logger.error("""
-                FCM Error: Invalid device token
-                - The FCM_DEVICE_TOKEN is not valid
-                - Make sure you're using a valid token from your mobile app
-                """)
-            elif e.response and e.response.status_code == 401:
-                logger.error("""
-                FCM Error: Invalid server key
-                - The FCM_SERVER_KEY is not valid
-                - Make sure you're using the correct key from Firebase Console
-                """)
+        except httpx.HTTPStatusError as e:
+            hint = _FCM_ERRORS.get(e.response.status_code)
+            if hint:
+                logger.error(hint)
             else:
-                logger.error("FCM error: %s", str(e))
+                logger.error("FCM error: %s", e)
+            return False
+        except httpx.HTTPError as e:
+            logger.error("FCM error: %s", str(e))
             return False
         except Exception as e:
             logger.error("Unexpected FCM error: %s", str(e))
             return False
 
-    def _send_to_server(self, alert: AlertData) -> bool:
-        """Send event data to the main server's /events endpoint."""
+    def _post_fcm_once(self, body: bytes) -> None:
+        """Make a single FCM request, raising on any HTTP error status."""
+        response = self._get_fcm_http().post(
+            self.fcm_url,
+            headers=self._fcm_request_headers(),
+            content=body
+        )
+        response.raise_for_status()
+
+    def _with_retry(self, func, *args, retryable: Callable[[Exception], bool] = _is_transient, **kwargs):
+        """Call a provider function, retrying transient failures with exponential backoff.
+
+        retryable decides which errors are transient. Permanent errors (bad
+        credentials, invalid numbers/tokens) and the last transient one are
+        re-raised for the caller's error handling.
+        """
+        for attempt in range(SEND_MAX_ATTEMPTS):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt == SEND_MAX_ATTEMPTS - 1 or not retryable(e):
+                    raise
+                delay = min(SEND_BACKOFF * 2 ** attempt, SEND_BACKOFF_MAX)
+                logger.warning("Transient error (%s), retrying in %.1fs", e, delay)
+                time.sleep(delay)
+
+    def _circuit_open(self, channel: str) -> bool:
+        """Check whether a channel is being skipped after repeated failures."""
+        return time.monotonic() < self._breakers[channel]['open_until']
+
+    def _send_guarded(self, channel: str, alert: AlertData, body: Optional[str]) -> Any:
+        """Send on one channel through its circuit breaker.
+
+        After BREAKER_THRESHOLD consecutive failures the channel is skipped for
+        BREAKER_COOLDOWN seconds, so a provider outage doesn't make every alert
+        wait out its timeouts and retries.
+        """
+        if self._circuit_open(channel):
+            logger.debug("%s circuit open; skipping send", channel)
+            return 'circuit_open'
+        result = self._dispatch[channel](alert, body)
+        self._record_result(channel, bool(result))
+        return result
+
+    def _record_result(self, channel: str, ok: bool) -> None:
+        """Count a send towards the channel's circuit breaker."""
+        with self._breaker_lock:
+            breaker = self._breakers[channel]
+            if ok:
+                breaker['fails'] = 0
+            else:
+                breaker['fails'] += 1
+                if breaker['fails'] >= BREAKER_THRESHOLD:
+                    breaker['fails'] = 0
+                    breaker['open_until'] = time.monotonic() + BREAKER_COOLDOWN
+                    logger.error("%s failed %d times in a row; pausing it for %.0fs",
+                                 channel, BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+
+    def _send_to_server(self, alert: AlertData, payload: Optional[bytes] = None) -> bool:
+        """Queue event data for the main server's /events/batch endpoint.
+
+        Returns True once the event is queued; delivery failures are logged
+        by the batch worker.
+        """
         if not self.server_api_configured:
             logger.warning("Event reporting to server skipped - Server API not configured")
             return False
 
         try:
-            # Prepare data matching the server's RaspberryPiEvent schema
-            # Ensure severity is a valid enum value expected by the server
-            valid_severities = ["info", "warning", "error", "critical"]
-            payload_severity = alert.severity.lower() if isinstance(alert.severity, str) else "info" # Default to info
-            if payload_severity not in valid_severities:
-                 logger.warning(f"Invalid severity '{alert.severity}' for event '{alert.event_type}'. Defaulting to 'info'.")
-                 payload_severity = "info"
-
-            # Attempt to make sensor_data JSON serializable (basic approach)
-            serializable_sensor_data = None
-            if isinstance(alert.sensor_data, dict):
-                try:
-                    # Create a copy to avoid modifying the original alert object
-                    data_copy = copy.deepcopy(alert.sensor_data)
-                    # Attempt to convert non-serializable items (e.g., datetime) to strings
-                    for key, value in data_copy.items():
-                        if isinstance(value, datetime):
-                            data_copy[key] = value.isoformat()
-                        # Add more conversions if needed (e.g., for custom objects)
-
-                    # Test if it dumps without error before sending
-                    json.dumps(data_copy)
-                    serializable_sensor_data = data_copy
-                except TypeError as json_err:
-                    logger.warning(f"Could not make sensor_data fully JSON serializable for event '{alert.event_type}': {json_err}. Sending without it.")
-                    serializable_sensor_data = {"error": "Data not serializable"}
-            elif alert.sensor_data is not None:
-                # Handle cases where sensor_data is not a dict but also not None
-                logger.warning(f"Sensor data for event '{alert.event_type}' is not a dictionary. Type: {type(alert.sensor_data)}. Sending as string.")
-                serializable_sensor_data = {"raw": str(alert.sensor_data)}
-
-            payload = {
-                "event_type": alert.event_type,
-                "timestamp": alert.timestamp.isoformat(),
-                "message": alert.message,
-                "sensor_data": serializable_sensor_data, # Use potentially cleaned data
-                "media_url": alert.media_url,
-                "severity": payload_severity,
-                "source": "raspberry_pi"
-            }
+            if payload is None:
+                payload = self._server_payload_bytes(alert)
+            self._event_queue.put(payload)
+            return True
+        except Exception as e:
+            logger.error("An unexpected error occurred while queuing event '%s' for the server: %s", alert.event_type, e, exc_info=True)
+            return False
 
-            headers = {
-                'Content-Type': 'application/json',
-                'X-API-Key': self.api_key
-            }
+    def _build_server_payload(self, alert: AlertData) -> Dict[str, Any]:
+        """Build the event dict matching the server's RaspberryPiEvent schema."""
+        # Ensure severity is a valid enum value expected by the server
+        valid_severities = ["info", "warning", "error", "critical"]
+        payload_severity = alert.severity.lower() if isinstance(alert.severity, str) else "info" # Default to info
+        if payload_severity not in valid_severities:
+             logger.warning("Invalid severity '%s' for event '%s'. Defaulting to 'info'.", alert.severity, alert.event_type)
+             payload_severity = "info"
+
+        # sensor_data is referenced as-is; datetimes and other values are
+        # converted during serialization
+        sensor_data = alert.sensor_data
+        if sensor_data is not None and not isinstance(sensor_data, dict):
+            # Handle cases where sensor_data is not a dict but also not None
+            logger.warning("Sensor data for event '%s' is not a dictionary. Type: %s. Sending as string.", alert.event_type, type(alert.sensor_data))
+            sensor_data = {"raw": str(sensor_data)}
+
+        return {
+            "event_type": alert.event_type,
+            "timestamp": alert.ts_iso,
+            "message": alert.message,
+            "sensor_data": sensor_data,
+            "media_url": alert.media_url,
+            "severity": payload_severity,
+            "source": "raspberry_pi"
+        }
+
+    def _server_payload_bytes(self, alert: AlertData) -> bytes:
+        """Serialize the server event in a single pass; the bytes are queued as-is."""
+        payload = self._build_server_payload(alert)
+        try:
+            return _dumps(payload)
+        except (TypeError, ValueError) as json_err:
+            # e.g. non-string keys or circular references in sensor_data
+            logger.warning("Could not make sensor_data fully JSON serializable for event '%s': %s. Sending without it.", alert.event_type, json_err)
+            payload["sensor_data"] = {"error": "Data not serializable"}
+            return _dumps(payload)
 
-            logger.debug(f"Sending event payload to server: {json.dumps(payload)}") # Log the actual payload
+    def _event_worker(self) -> None:
+        """Drain queued server events and POST them in batches.
 
-            response = requests.post(
-                self.server_events_endpoint,
-                headers=headers,
-                data=json.dumps(payload), # Serialize final payload to JSON string
-                timeout=10
+        Events arriving together (e.g. motion, door and RFID on one entry)
+        share a single round trip: the worker waits up to EVENT_BATCH_MAX_WAIT
+        after the first event for up to EVENT_BATCH_MAX_ITEMS events.
+        """
+        while True:
+            batch = _drain_batch(self._event_queue, EVENT_BATCH_MAX_ITEMS, EVENT_BATCH_MAX_WAIT)
+            try:
+                self._post_event_batch(batch)
+            finally:
+                for _ in batch:
+                    self._event_queue.task_done()
+
+    def _post_event_batch(self, batch: List[bytes]) -> bool:
+        """POST pre-serialized events to the server as one JSON array."""
+        import requests
+        body = b'[' + b','.join(batch) + b']'
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending event batch to server: %s", body[:LOG_PAYLOAD_LIMIT])
+
+            response = self._get_http_session().post(
+                self.server_batch_endpoint,
+                headers=self._server_headers,
+                data=body,
+                timeout=HTTP_TIMEOUT
             )
 
             # Check specifically for 422 error
             if response.status_code == 422:
-                logger.error(f"Failed to send event '{alert.event_type}' to server. Status: 422 Unprocessable Entity. Response: {response.text}")
+                logger.error("Failed to send %d event(s) to server. Status: 422 Unprocessable Entity. Response: %s", len(batch), response.text)
                 # Log the payload that failed validation for debugging
-                logger.error(f"Failing Payload: {json.dumps(payload)}")
+                logger.error("Failing Payload (status=%d): %s", response.status_code, body[:LOG_PAYLOAD_LIMIT])
                 return False
-            
+
             response.raise_for_status()
 
-            logger.info(f"Event '{alert.event_type}' sent to server successfully. Status: {response.status_code}")
+            logger.info("%d event(s) sent to server successfully. Status: %s", len(batch), response.status_code)
             return True
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to send event '{alert.event_type}' to server: {e}")
+            logger.error("Failed to send %d event(s) to server: %s", len(batch), e)
             return False
         except Exception as e:
-            logger.error(f"An unexpected error occurred while sending event '{alert.event_type}' to server: {e}", exc_info=True)
+            logger.error("An unexpected error occurred while sending %d event(s) to server: %s", len(batch), e, exc_info=True)
             return False
 
     def _format_message(self, alert: AlertData) -> str:
-        """Format alert message with all relevant information."""
-        message = [
-            f"Server Room Alert: {alert.event_type}",
-            f"Time: {alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Message: {alert.message}",
-            f"Severity: {alert.severity}"
-        ]
-
-        if alert.sensor_data:
-            message.append("\nSensor Data:")
-            for key, value in alert.sensor_data.items():
-                message.append(f"- {key}: {value}")
-
-        if alert.media_url:
-            message.append(f"\nMedia URL: {alert.media_url}")
-
-        return "\n".join(message)
-
-    def send_alert(self, alert: AlertData, channels: Optional[List[str]] = None) -> None:
-        """Send alert via specified or all configured channels."""
+        """Format alert message with all relevant information.
+
+        The text is cached on the alert, so SMS, email and retries share one
+        formatting pass; alerts should not be modified after being sent.
+        """
+        if alert._text is None:
+            sensor_items = (tuple((str(key), str(value)) for key, value in alert.sensor_data.items())
+                            if alert.sensor_data else ())
+            alert._text = _render_alert_text(alert.event_type, alert.ts_human, alert.message,
+                                             alert.severity, sensor_items, alert.media_url)
+        return alert._text
+
+    def enqueue(self, alert: AlertData) -> None:
+        """Queue an alert for batched dispatch on all configured channels.
+
+        Unlike send_alert this returns immediately. Alerts arriving within
+        ALERT_BATCH_MAX_WAIT of each other (e.g. a multi-sensor storm) are
+        sent together: text-only SMS are coalesced into one summary and
+        emails go back-to-back over the pooled SMTP session.
+        """
+        self._alert_queue.put(alert)
+
+    def _alert_worker(self) -> None:
+        """Drain enqueued alerts and dispatch them in batches."""
+        while True:
+            batch = _drain_batch(self._alert_queue, ALERT_BATCH_MAX_ITEMS, ALERT_BATCH_MAX_WAIT)
+            try:
+                self._dispatch_batch(batch)
+            except Exception as e:
+                logger.error("Unexpected error dispatching %d queued alert(s): %s", len(batch), e, exc_info=True)
+            finally:
+                for _ in batch:
+                    self._alert_queue.task_done()
+
+    def _dispatch_batch(self, alerts: List[AlertData]) -> None:
+        """Send a batch of alerts with one pass per channel."""
+        alerts = [alert for alert in alerts if not self._is_duplicate(alert)]
+        if not alerts:
+            return
+        if len(alerts) == 1:
+            self.send_alert(alerts[0], force=True)  # Already checked for duplicates
+            return
+
+        logger.info("Sending batch of %d alerts", len(alerts))
+        bodies = [self._format_message(alert) for alert in alerts]
+        for alert in alerts:
+            self._send_to_server(alert)
+
+        senders = {'sms': self._send_sms_many, 'email': self._send_email_many, 'fcm': self._send_fcm_many}
+        futures = {self._submit(self._executor, senders[channel], alerts, bodies): channel
+                   for channel in self._active_channels if not self._circuit_open(channel)}
+        done, not_done = wait(futures, timeout=self.config.send_timeout)
+        for future in done:
+            if future.exception() is not None:
+                logger.error("Unexpected error sending %s alert batch: %s", futures[future], future.exception())
+        for future in not_done:
+            logger.warning("%s alert batch still pending after %.0fs; not waiting for it",
+                           futures[future], self.config.send_timeout)
+
+    def _send_sms_many(self, alerts: List[AlertData], bodies: List[str]) -> None:
+        """Send SMS for a batch, coalescing text-only alerts into one summary message."""
+        text_only = [alert for alert in alerts if not alert.media_url]
+        # Alerts with media are sent individually, concurrently, so each keeps its MMS attachment
+        media = [(alert, body) for alert, body in zip(alerts, bodies) if alert.media_url]
+        futures = [self._submit(self._sms_executor, self._send_guarded, 'sms', alert, body)
+                   for alert, body in media]
+        if len(text_only) == 1:
+            self._send_guarded('sms', text_only[0], None)
+        elif text_only:
+            self._send_guarded('sms', text_only[-1], self._format_summary(text_only))
+        wait(futures)
+
+    def _send_email_many(self, alerts: List[AlertData], bodies: List[str]) -> None:
+        """Send one email per alert back-to-back over the pooled SMTP session.
+
+        The SMTP lock is taken per message inside _send_smtp, so retry
+        backoff never blocks other threads' emails or the keepalive.
+        """
+        for alert, body in zip(alerts, bodies):
+            self._send_guarded('email', alert, body)
+
+    def _send_fcm_many(self, alerts: List[AlertData], bodies: List[str]) -> None:
+        """Send one push notification per alert and device, all concurrently.
+
+        Each alert counts towards the FCM circuit breaker like a _send_guarded
+        send: it succeeds only if every device received it.
+        """
+        if self._circuit_open('fcm'):
+            logger.debug("fcm circuit open; skipping send")
+            return
+        heads = self._fcm_heads
+        messages = [self._fcm_body(head, _dumps(self._fcm_content(alert)))
+                    for alert in alerts for head in heads]
+        futures = [self._submit(self._fcm_executor, self._post_fcm, message) for message in messages]
+        results = [future.result() for future in futures]
+        for i in range(0, len(results), len(heads)):
+            self._record_result('fcm', all(results[i:i + len(heads)]))
+        delivered = sum(results)
+        if delivered < len(messages):
+            logger.warning("FCM batch delivered %d of %d notifications", delivered, len(messages))
+
+    def send_alerts(self, alerts: List[AlertData]) -> None:
+        """Send several alerts at once, blocking until the batch has been sent.
+
+        Duplicates are dropped as in send_alert; the rest go out with one pass
+        per channel, like a batch collected by enqueue().
+        """
+        self._dispatch_batch(list(alerts))
+
+    def _format_summary(self, alerts: List[AlertData]) -> str:
+        """Format several alerts as one short summary message."""
+        lines = "\n".join(f"- {alert.ts_human[11:]} {alert.event_type}: {alert.message}"
+                          for alert in alerts)
+        return f"{ALERT_TITLE_PREFIX}{len(alerts)} events\n{lines}"
+
+    async def send_alert_async(self, alert: AlertData, channels: Optional[List[str]] = None,
+                               force: bool = False) -> Dict[str, Any]:
+        """Awaitable send_alert for asyncio callers.
+
+        The senders use blocking clients (smtplib, Twilio, httpx.Client), so the
+        whole fan-out runs off the event loop and the loop is never blocked.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.send_alert, alert, channels, force))
+
+    def _is_duplicate(self, alert: AlertData) -> bool:
+        """Check whether an identical alert was sent within the debounce window.
+
+        Alerts are identical when event type, severity and sensor data match.
+        A non-duplicate is recorded as sent now.
+        """
+        sensor_data = alert.sensor_data
+        if isinstance(sensor_data, dict):
+            sensor_data = sorted(sensor_data.items(), key=lambda item: str(item[0]))
+        key = hashlib.blake2b(repr((alert.event_type, alert.severity, sensor_data)).encode(),
+                              digest_size=16).hexdigest()
+        now = time.monotonic()
+        window = self.config.debounce_s
+        with self._recent_lock:
+            if now - self._recent.get(key, float('-inf')) < window:
+                return True
+            self._recent[key] = now
+            # Evict stale fingerprints so flapping sensors can't grow the dict unbounded
+            if len(self._recent) > 64:
+                self._recent = {k: t for k, t in self._recent.items() if now - t < window * 4}
+        return False
+
+    def send_alert(self, alert: AlertData, channels: Optional[List[str]] = None,
+                   force: bool = False) -> Dict[str, Any]:
+        """Send alert via specified or all configured channels.
+
+        The server report and each channel are sent concurrently; returns a
+        mapping of channel name to that sender's result (None if it failed or
+        did not finish within the configured send timeout).
+
+        Repeats of an identical alert within the debounce window are dropped
+        and reported as {"suppressed": True}; pass force=True for alerts that
+        must always go out.
+        """
+        if not force and self._is_duplicate(alert):
+            logger.info("Suppressing duplicate alert for event: %s", alert.event_type)
+            return {"suppressed": True}
+
         logger.info("Sending alert for event: %s", alert.event_type)
 
-        server_success = self._send_to_server(alert)
-        if not server_success:
-            logger.warning(f"Failed to log event {alert.event_type} to the main server.")
+        if channels is None:
+            target_channels = self._active_channels
+        else:
+            target_channels = [c for c in channels if c in self._active_channels]
+            skipped = [c for c in channels if c in self._dispatch and c not in self._active_channels]
+            if skipped:
+                logger.debug("Skipping unconfigured channels: %s", ", ".join(skipped))
+
+        # Format the text body and serialize the server payload once, shared by all channels;
+        # the body is only needed when a text channel is actually sent
+        body = (self._format_message(alert)
+                if 'sms' in target_channels or 'email' in target_channels else None)
+        payload = self._server_payload_bytes(alert) if self.server_api_configured else None
+
+        # Queuing the server event is cheap, so it is done inline
+        results: Dict[str, Any] = {'server': self._send_to_server(alert, payload)}
+
+        futures = {self._submit(self._executor, self._send_guarded, channel, alert, body): channel
+                   for channel in target_channels}
+
+        # Wait at most send_timeout for the slowest channel; a stalled provider
+        # keeps running in the pool but no longer holds up the caller
+        done, not_done = wait(futures, timeout=self.config.send_timeout)
+        for future in done:
+            channel = futures[future]
+            try:
+                results[channel] = future.result()
+            except Exception as e:
+                logger.error("Unexpected error sending %s alert: %s", channel, e)
+                results[channel] = None
+        for future in not_done:
+            logger.warning("%s alert still pending after %.0fs; not waiting for it",
+                           futures[future], self.config.send_timeout)
+            results[futures[future]] = None
+
+        if not results.get('server'):
+            logger.warning("Failed to queue event %s for the main server.", alert.event_type)
+        return results
+
+_manager: Optional[NotificationManager] = None
+_manager_lock = threading.Lock()
 
-        target_channels = channels or ['sms', 'email', 'fcm']
+def get_notification_manager() -> NotificationManager:
+    """Return the process-wide NotificationManager, creating it on first use.
 
-        if "sms" in target_channels:
-            self._send_sms(alert)
-        if "email" in target_channels:
-            self._send_email(alert)
-        if "fcm" in target_channels:
-            self._send_fcm(alert)
+    Every component should share this instance so there is one SMTP session,
+    one HTTP/2 connection to FCM and one set of worker threads per process.
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = NotificationManager()
+    return _manager
 
 def create_intrusion_alert(
     event_type: str,
@@ -493,23 +1293,24 @@ if __name__ == "__main__":
 
         # Test sending to server API (most likely to be configured)
         logger.info("--- Testing Server API Send ---")
-        manager.send_alert(test_alert, channels=['server'])
+        manager.send_alert(test_alert, channels=['server'], force=True)
         time.sleep(2)
 
         # Test sending via Email
         logger.info("--- Testing Email Send ---")
-        manager.send_alert(test_alert, channels=['email'])
+        manager.send_alert(test_alert, channels=['email'], force=True)
         time.sleep(2)
 
         # Test sending via SMS
         logger.info("--- Testing SMS Send ---")
-        manager.send_alert(test_alert, channels=['sms'])
+        manager.send_alert(test_alert, channels=['sms'], force=True)
         time.sleep(2)
 
         # Test sending via FCM
         logger.info("--- Testing FCM Send ---")
-        manager.send_alert(test_alert, channels=['fcm'])
+        manager.send_alert(test_alert, channels=['fcm'], force=True)
 
         logger.info("Notification tests completed.")
 
+    configure()
     main()
\ No newline at end of file
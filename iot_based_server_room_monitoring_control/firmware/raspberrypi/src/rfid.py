@@ -10,14 +10,25 @@ Dependencies:
     - spidev library (install with `pip install spidev`) - Only on Raspberry Pi
 """
 
+import ctypes
+import fcntl
 import logging
+import operator
+import os
+import queue
+import struct
+import threading
 import time
+from functools import lru_cache, reduce
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 from enum import IntEnum
 import platform
 import random
-import spidev
+try:
+    import spidev
+except ImportError:  # Only installed on the Pi
+    spidev = None
 # import RPi.GPIO as GPIO # Removed to avoid conflict with gpiozero
 
 # Configure logging
@@ -27,6 +38,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# struct spi_ioc_transfer from linux/spi/spidev.h (32 bytes)
+_SPI_IOC_TRANSFER = struct.Struct("=QQIIHBBBBBB")
+
+def _spi_ioc_message(count: int) -> int:
+    """Return the SPI_IOC_MESSAGE(count) ioctl request number."""
+    return 0x40000000 | ((_SPI_IOC_TRANSFER.size * count) << 16) | (ord('k') << 8)
+
+_SPI_IOC_MESSAGE_1 = _spi_ioc_message(1)
+
+def _crc_a_entry(index: int) -> int:
+    """Return the CRC_A table entry for one byte of (crc ^ data)."""
+    crc = index
+    for _ in range(8):
+        crc = (crc >> 1) ^ 0x8408 if crc & 1 else crc >> 1
+    return crc
+
+_CRC_A_TABLE = tuple(_crc_a_entry(i) for i in range(256))
+
+def crc_a(data) -> bytes:
+    """Compute the ISO/IEC 14443-3 CRC_A of data, low byte first.
+
+    Same result as the MFRC522 CRC coprocessor with its default preset
+    (0x6363, reflected polynomial 0x8408), without any SPI traffic.
+    """
+    crc, table = 0x6363, _CRC_A_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return struct.pack("<H", crc)
+
 class RFIDStatus(IntEnum):
     """Status codes for RFID operations."""
     OK = 0
@@ -39,24 +79,34 @@ class CardInfo:
     name: str
     role: str
 
-# Authorized cards with their UIDs and information
-AUTHORIZED_CARDS: Dict[Tuple[int, int, int, int, int], CardInfo] = {
-    (5, 74, 28, 185, 234): CardInfo("Card A", "admin"),
-    (83, 164, 247, 164, 164): CardInfo("Card B", "IT staff"),
-    (20, 38, 121, 207, 132): CardInfo("Card C", "security")
+# Authorized cards keyed by their 5-byte UID (4 UID bytes + BCC)
+AUTHORIZED_CARDS: Dict[bytes, CardInfo] = {
+    bytes((5, 74, 28, 185, 234)): CardInfo("Card A", "admin"),
+    bytes((83, 164, 247, 164, 164)): CardInfo("Card B", "IT staff"),
+    bytes((20, 38, 121, 207, 132)): CardInfo("Card C", "security")
 }
 
-# Check if running on Raspberry Pi
-try:
-    # IS_RASPBERRY_PI = platform.machine().startswith(('arm', 'aarch64'))
-    IS_RASPBERRY_PI = False
-    if IS_RASPBERRY_PI:
+@lru_cache(maxsize=None)
+def use_rfid_hardware() -> bool:
+    """Return whether to drive a real MFRC522, deciding once per process.
+
+    RFID_BACKEND is "mock" (the default), "real", or "auto" to use the
+    hardware on ARM boards. It is read on first use rather than at import,
+    since main.py loads its .env file after importing the sensor modules.
+    """
+    backend = os.getenv("RFID_BACKEND", "mock").lower()
+    if backend == "auto":
+        real = platform.machine().startswith(('arm', 'aarch64'))
+    else:
+        real = backend == "real"
+    if real and spidev is None:
+        logger.warning("Running in mock mode - spidev is not installed")
+        return False
+    if real:
         logger.info("Running on Raspberry Pi with real RFID hardware")
     else:
         logger.warning("Not running on Raspberry Pi, using mock implementation")
-except ImportError:
-    IS_RASPBERRY_PI = False
-    logger.warning("Running in mock mode - no Raspberry Pi RFID hardware detected")
+    return real
 
 class MockMFRC522:
     """Mock MFRC522 RFID reader implementation for non-Raspberry Pi systems."""
@@ -76,41 +126,57 @@ class MockMFRC522:
     PICC_TRANSFER = 0xB0
     PICC_HALT = 0x50
     
-    def __init__(self, spd: int = 1000000) -> None:
+    def __init__(self, spd: int = 8000000, irq_pin: Optional[int] = None) -> None:
         """Initialize the mock RFID reader."""
         self.spd = spd
-        self._last_read_time = 0
-        self._read_cooldown = 150.0  # time to wait before next read
-        # Get list of authorized UIDs for random selection
-        self._authorized_uids = list(AUTHORIZED_CARDS.keys())
+        self._last_read_time = 0.0
+        self._read_cooldown = 60.0  # seconds between simulated reads, like the old fixed polling
+        # Authorized UIDs for random selection; bytes, so they can be returned without copying
+        self._authorized_uids = tuple(AUTHORIZED_CARDS)
+        # Private generator with its methods bound once for the scan loop
+        rng = random.Random()
+        self._random, self._choice, self._randbytes = rng.random, rng.choice, rng.randbytes
         logger.info("Mock MFRC522 initialized")
         
     def MFRC522_Request(self, reqMode: int) -> Tuple[int, int]:
         """Mock tag request."""
         return RFIDStatus.OK, 0x10
         
-    def MFRC522_Anticoll(self) -> Tuple[int, List[int]]:
+    def MFRC522_Anticoll(self) -> Tuple[int, bytes]:
         """Mock anti-collision detection."""
         # Simulate random card detection
-        if random.random() < 0.3:  # 30% chance of detecting a card
-            # 70% chance of detecting an authorized card, 30% chance of random card
-            if random.random() < 0.8:
+        if self._random() < 0.3:  # 30% chance of detecting a card
+            # 80% chance of detecting an authorized card, 20% chance of random card
+            if self._random() < 0.8:
                 # Select a random authorized card
-                uid = list(random.choice(self._authorized_uids))
-                logger.debug("Mock detected authorized card: %s", uid)
+                uid = self._choice(self._authorized_uids)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Mock detected authorized card: %s", list(uid))
                 return RFIDStatus.OK, uid
             else:
                 # Generate a random unauthorized UID
-                uid = [random.randint(0, 255) for _ in range(5)]
-                logger.debug("Mock detected unauthorized card: %s", uid)
+                uid = self._randbytes(5)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Mock detected unauthorized card: %s", list(uid))
                 return RFIDStatus.OK, uid
-        return RFIDStatus.NO_TAG, []
+        return RFIDStatus.NO_TAG, b""
         
-    def MFRC522_SelectTag(self, serNum: List[int]) -> int:
+    def wait_for_tag(self, timeout: float) -> bool:
+        """Mock tag wait; offers a read at most once per read cooldown."""
+        remaining = self._last_read_time + self._read_cooldown - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return False
+        if remaining > 0:
+            time.sleep(remaining)
+        self._last_read_time = time.monotonic()
+        return True
+
+    def MFRC522_SelectTag(self, serNum: bytes) -> int:
         """Mock tag selection."""
         return 0x08
         
-    def MFRC522_Auth(self, authMode: int, blockAddr: int, sectorKey: List[int], serNum: List[int]) -> int:
+    def MFRC522_Auth(self, authMode: int, blockAddr: int, sectorKey: bytes, serNum: bytes) -> int:
         """Mock authentication."""
         return RFIDStatus.OK
         
@@ -118,7 +184,7 @@ class MockMFRC522:
         """Mock read operation."""
         logger.debug("Mock read from block %d", blockAddr)
         
-    def MFRC522_Write(self, blockAddr: int, writeData: List[int]) -> None:
+    def MFRC522_Write(self, blockAddr: int, writeData: bytes) -> None:
         """Mock write operation."""
         logger.debug("Mock write to block %d", blockAddr)
         
@@ -137,6 +203,23 @@ class MFRC522:
     # NRSTPD = 22 # Removed as RPi.GPIO is no longer used
     MAX_LEN = 16
 
+    # IRQ polling: samples per SPI transfer, transfers before giving up (2000
+    # samples in all), and the busy transfers allowed before sleeping between them
+    IRQ_POLL_BURST = 8
+    IRQ_POLL_BATCHES = 250
+    IRQ_POLL_SPIN = 32
+    IRQ_POLL_SLEEP = 0.0005
+    # Upper bound on a command when waiting on the IRQ pin; the MFRC522 timer
+    # set up in MFRC522_Init fires after about 25 ms
+    IRQ_WAIT_TIMEOUT = 0.05
+    # Seconds between REQA probes while waiting for a tag on the IRQ pin
+    IRQ_REARM_INTERVAL = 0.1
+    # Preallocated SPI buffer size: a full 64-byte FIFO plus the address byte
+    SPI_BUF_LEN = 65
+    # SPI address bytes for every register, indexed by register address
+    WRITE_ADDR = tuple((reg << 1) & 0x7E for reg in range(0x40))
+    READ_ADDR = tuple(((reg << 1) & 0x7E) | 0x80 for reg in range(0x40))
+
     # Register definitions
     CommandReg = 0x01
     CommIEnReg = 0x02
@@ -174,6 +257,12 @@ class MFRC522:
     ModGsCfgReg = 0x29
     DivIrqReg = 0x05
 
+    # Configuration registers only this driver writes, so their last written
+    # value can stand in for a read. Status, IRQ and FIFO registers change on
+    # their own and are always read from the chip.
+    SHADOWED_REGS = frozenset((CommIEnReg, BitFramingReg, ModeReg, TxControlReg, TxAutoReg,
+                               TModeReg, TPrescalerReg, TReloadRegL, TReloadRegH))
+
     # Command definitions
     PCD_IDLE = 0x00
     PCD_AUTHENT = 0x0E
@@ -198,19 +287,42 @@ class MFRC522:
     PICC_TRANSFER = 0xB0
     PICC_HALT = 0x50
 
-    def __init__(self, spd: int = 1000000) -> None:
-        """Initialize the MFRC522 RFID reader."""
-        if not IS_RASPBERRY_PI:
+    def __init__(self, spd: int = 8000000, irq_pin: Optional[int] = None) -> None:
+        """Initialize the MFRC522 RFID reader.
+
+        irq_pin is the BCM GPIO wired to the reader's IRQ output; without it,
+        wait_for_tag falls back to sleeping and callers poll.
+        """
+        self._irq = None
+        # Last value written to each of SHADOWED_REGS
+        self._shadow: Dict[int, int] = {}
+        if not use_rfid_hardware():
             logger.warning("Not running on Pi, MFRC522 in mock mode.")
             return # Don't initialize hardware in mock mode
 
         self.spi = spidev.SpiDev()
         self.spi.open(0, 0)
+        # The MFRC522 accepts up to 10 MHz; mode 0, MSB first, 8-bit words
         self.spi.max_speed_hz = spd
+        self.spi.mode = 0
+        self.spi.bits_per_word = 8
+        # Register accesses ioctl the spidev fd directly with preallocated
+        # buffers, skipping xfer2's list conversion. The reader is driven from
+        # one thread, so the buffers are not locked.
+        self._fd = self.spi.fileno()
+        self._tx = (ctypes.c_ubyte * self.SPI_BUF_LEN)()
+        self._rx = (ctypes.c_ubyte * self.SPI_BUF_LEN)()
+        self._ioc_reg = self._ioc_transfer(2)  # Single-register read or write
 
         # Set pin numbering mode - Rely on mode set by gpiozero (via main.py env var)
         logger.info("MFRC522: Assuming GPIO mode is already set (expecting BCM from gpiozero config).")
 
+        if irq_pin is not None:
+            from gpiozero import DigitalInputDevice
+            # The IRQ output is driven active-low (IRqInv is set in CommIEnReg)
+            self._irq = DigitalInputDevice(irq_pin, pull_up=True)
+            logger.info("MFRC522: Using IRQ on GPIO %d", irq_pin)
+
         # Removed NRSTPD pin initialization using RPi.GPIO
         # try:
         #     GPIO.setup(self.NRSTPD, GPIO.OUT)
@@ -224,39 +336,157 @@ class MFRC522:
     def MFRC522_Reset(self) -> None:
         """Reset the MFRC522 RFID reader."""
         self.Write_MFRC522(self.CommandReg, self.PCD_RESETPHASE)
+        self._shadow.clear()  # Registers are back at their reset values
+
+    def _ioc_transfer(self, length: int) -> bytes:
+        """Pack a spi_ioc_transfer of length bytes over the preallocated buffers."""
+        return _SPI_IOC_TRANSFER.pack(ctypes.addressof(self._tx), ctypes.addressof(self._rx),
+                                      length, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    def _check_burst_len(self, count: int) -> None:
+        """Reject bursts that would not fit the preallocated SPI buffers with their address byte."""
+        if count >= self.SPI_BUF_LEN:
+            raise ValueError(f"SPI burst of {count} bytes exceeds the {self.SPI_BUF_LEN - 1}-byte limit")
 
     def Write_MFRC522(self, addr: int, val: int) -> None:
         """Write a value to a register on the MFRC522."""
-        self.spi.xfer2([(addr << 1) & 0x7E, val])
+        tx = self._tx
+        tx[0] = self.WRITE_ADDR[addr]
+        tx[1] = val
+        fcntl.ioctl(self._fd, _SPI_IOC_MESSAGE_1, self._ioc_reg)
+        if addr in self.SHADOWED_REGS:
+            self._shadow[addr] = val
+
+    def _write_burst(self, addr: int, values: bytes) -> None:
+        """Write several values to one register in a single SPI transfer.
+
+        The MFRC522 keeps the address of a multi-byte SPI write fixed, so this
+        fills the FIFO with one transfer instead of one per byte.
+        """
+        values = bytes(values)
+        self._check_burst_len(len(values))
+        self._tx[0] = self.WRITE_ADDR[addr]
+        ctypes.memmove(ctypes.addressof(self._tx) + 1, values, len(values))
+        fcntl.ioctl(self._fd, _SPI_IOC_MESSAGE_1, self._ioc_transfer(len(values) + 1))
 
     def Read_MFRC522(self, addr: int) -> int:
         """Read a value from a register on the MFRC522."""
-        val = self.spi.xfer2([((addr << 1) & 0x7E) | 0x80, 0])
-        return val[1]
+        tx = self._tx
+        tx[0] = self.READ_ADDR[addr]
+        tx[1] = 0
+        fcntl.ioctl(self._fd, _SPI_IOC_MESSAGE_1, self._ioc_reg)
+        return self._rx[1]
+
+    def _read_burst(self, addr: int, count: int) -> List[int]:
+        """Read one register count times in a single SPI transfer."""
+        self._check_burst_len(count)
+        ctypes.memset(self._tx, self.READ_ADDR[addr], count)
+        self._tx[count] = 0
+        fcntl.ioctl(self._fd, _SPI_IOC_MESSAGE_1, self._ioc_transfer(count + 1))
+        return self._rx[1:count + 1]
+
+    def _read_many(self, addrs: Tuple[int, ...]) -> List[int]:
+        """Read several registers in a single SPI transfer.
+
+        Each address byte clocks out the value of the register addressed by
+        the byte before it, so one frame of len(addrs) + 1 bytes reads them all.
+        """
+        count = len(addrs)
+        self._check_burst_len(count)
+        tx, read_addr = self._tx, self.READ_ADDR
+        for i, addr in enumerate(addrs):
+            tx[i] = read_addr[addr]
+        tx[count] = 0
+        fcntl.ioctl(self._fd, _SPI_IOC_MESSAGE_1, self._ioc_transfer(count + 1))
+        return self._rx[1:count + 1]
+
+    def _xfer_chain(self, transfers: List[bytes]) -> List[bytes]:
+        """Run several SPI transfers with a single ioctl.
+
+        Returns the bytes received during each transfer. CS is still released
+        between transfers, because the MFRC522 takes one register address per
+        CS frame; the saving is one syscall for the chain instead of one each.
+        """
+        tx_buffers, rx_buffers = [], []  # Must stay alive until the ioctl returns
+        request = bytearray()
+        last = len(transfers) - 1
+        for i, data in enumerate(transfers):
+            tx = ctypes.create_string_buffer(data, len(data))
+            rx = ctypes.create_string_buffer(len(data))
+            tx_buffers.append(tx)
+            rx_buffers.append(rx)
+            # speed_hz=0 and bits_per_word=0 use the device settings
+            request += _SPI_IOC_TRANSFER.pack(ctypes.addressof(tx), ctypes.addressof(rx), len(data),
+                                              0, 0, 0, int(i < last), 0, 0, 0, 0)
+        fcntl.ioctl(self.spi.fileno(), _spi_ioc_message(len(transfers)), bytes(request))
+        return [rx.raw for rx in rx_buffers]
+
+    def _write_regs(self, writes: List[Tuple[int, int]]) -> None:
+        """Write (register, value) pairs in order with a single ioctl."""
+        write_addr = self.WRITE_ADDR
+        self._xfer_chain([bytes((write_addr[addr], val)) for addr, val in writes])
+        self._shadow.update((addr, val) for addr, val in writes if addr in self.SHADOWED_REGS)
+
+    def _wait_irq(self, waitIRq: int) -> Optional[int]:
+        """Wait until the timer or a waited-for IRQ fires.
+
+        With an IRQ pin the thread sleeps on the pin; otherwise CommIrqReg is
+        polled, busily for the first IRQ_POLL_SPIN bursts (most commands
+        finish within them) and with short sleeps after that. An error IRQ
+        ends the wait early, since ToCard fails on ErrorReg anyway. Returns
+        the CommIrqReg value, or None on timeout.
+        """
+        if self._irq is not None:
+            if not self._irq.wait_for_active(timeout=self.IRQ_WAIT_TIMEOUT):
+                return None
+            return self.Read_MFRC522(self.CommIrqReg)
+        read_burst, reg, burst = self._read_burst, self.CommIrqReg, self.IRQ_POLL_BURST
+        done = waitIRq | 0x03
+        for batch in range(self.IRQ_POLL_BATCHES):
+            for n in read_burst(reg, burst):
+                if n & done:
+                    return n
+            if batch >= self.IRQ_POLL_SPIN:
+                time.sleep(self.IRQ_POLL_SLEEP)
+        return None
 
     def SetBitMask(self, reg: int, mask: int) -> None:
-        """Set bits in a register on the MFRC522."""
-        tmp = self.Read_MFRC522(reg)
+        """Set bits in a register on the MFRC522.
+
+        Shadowed registers skip the read, and the write too if the bits are
+        already set.
+        """
+        tmp = self._shadow.get(reg)
+        if tmp is None:
+            tmp = self.Read_MFRC522(reg)
+        elif tmp | mask == tmp:
+            return
         self.Write_MFRC522(reg, tmp | mask)
 
     def ClearBitMask(self, reg: int, mask: int) -> None:
-        """Clear bits in a register on the MFRC522."""
-        tmp = self.Read_MFRC522(reg)
+        """Clear bits in a register on the MFRC522.
+
+        Shadowed registers skip the read, and the write too if the bits are
+        already clear.
+        """
+        tmp = self._shadow.get(reg)
+        if tmp is None:
+            tmp = self.Read_MFRC522(reg)
+        elif not tmp & mask:
+            return
         self.Write_MFRC522(reg, tmp & (~mask))
 
     def AntennaOn(self) -> None:
-        """Turn the antenna on."""
-        temp = self.Read_MFRC522(self.TxControlReg)
-        if ~(temp & 0x03):
-            self.SetBitMask(self.TxControlReg, 0x03)
+        """Turn the antenna on, unless both TX drivers already are."""
+        self.SetBitMask(self.TxControlReg, 0x03)
 
     def AntennaOff(self) -> None:
         """Turn the antenna off."""
         self.ClearBitMask(self.TxControlReg, 0x03)
 
-    def MFRC522_ToCard(self, command: int, sendData: List[int]) -> Tuple[int, List[int], int]:
+    def MFRC522_ToCard(self, command: int, sendData: bytes) -> Tuple[int, bytes, int]:
         """Communicate with a card."""
-        backData = []
+        backData = b""
         backLen = 0
         status = RFIDStatus.ERROR
         irqEn = 0x00
@@ -269,102 +499,132 @@ class MFRC522:
             irqEn = 0x77
             waitIRq = 0x30
 
-        self.Write_MFRC522(self.CommIEnReg, irqEn | 0x80)
+        # On the IRQ pin, only the awaited, error and timer interrupts may wake _wait_irq
+        self.Write_MFRC522(self.CommIEnReg, (irqEn if self._irq is None else waitIRq | 0x03) | 0x80)
         self.ClearBitMask(self.CommIrqReg, 0x80)
         self.SetBitMask(self.FIFOLevelReg, 0x80)
         self.Write_MFRC522(self.CommandReg, self.PCD_IDLE)
 
-        for data in sendData:
-            self.Write_MFRC522(self.FIFODataReg, data)
+        self._write_burst(self.FIFODataReg, sendData)
 
         self.Write_MFRC522(self.CommandReg, command)
 
         if command == self.PCD_TRANSCEIVE:
             self.SetBitMask(self.BitFramingReg, 0x80)
 
-        i = 2000
-        while i:
-            n = self.Read_MFRC522(self.CommIrqReg)
-            i -= 1
-            if n & 0x01 or n & waitIRq:
-                break
+        n = self._wait_irq(waitIRq)
 
         self.ClearBitMask(self.BitFramingReg, 0x80)
 
-        if i:
-            if not (self.Read_MFRC522(self.ErrorReg) & 0x1B):
+        if n is not None:
+            # The FIFO level and last-bit count are only needed without errors,
+            # but reading them alongside ErrorReg costs nothing extra
+            error, level, control = self._read_many((self.ErrorReg, self.FIFOLevelReg, self.ControlReg))
+            if not (error & 0x1B):
                 status = RFIDStatus.OK
                 if n & irqEn & 0x01:
                     status = RFIDStatus.NO_TAG
 
                 if command == self.PCD_TRANSCEIVE:
-                    n = self.Read_MFRC522(self.FIFOLevelReg)
-                    lastBits = self.Read_MFRC522(self.ControlReg) & 0x07
+                    n = level
+                    lastBits = control & 0x07
                     backLen = (n - 1) * 8 + lastBits if lastBits else n * 8
                     n = min(n, self.MAX_LEN)
 
-                    for _ in range(n):
-                        backData.append(self.Read_MFRC522(self.FIFODataReg))
+                    if n:
+                        backData = bytes(self._read_burst(self.FIFODataReg, n))
             else:
                 status = RFIDStatus.ERROR
 
         return status, backData, backLen
 
+    def wait_for_tag(self, timeout: float) -> bool:
+        """Block until a tag answers a REQA or timeout elapses.
+
+        A REQA is sent every IRQ_REARM_INTERVAL with only RxIRq enabled, and
+        the thread sleeps on the IRQ pin edge in between. While the field is
+        empty that costs one chained SPI ioctl (six register writes) per
+        interval, instead of busy-polling CommIrqReg. Returns True if a tag
+        answered.
+        """
+        if self._irq is None:
+            time.sleep(timeout)
+            return True
+        deadline = time.monotonic() + timeout
+        while True:
+            self._write_regs([
+                (self.CommIrqReg, 0x7F),    # Clear pending IRQs
+                (self.CommIEnReg, 0xA0),    # IRqInv | RxIEn
+                (self.FIFOLevelReg, 0x80),  # Flush the FIFO
+                (self.FIFODataReg, self.PICC_REQIDL),
+                (self.CommandReg, self.PCD_TRANSCEIVE),
+                (self.BitFramingReg, 0x87),  # StartSend, 7-bit frame
+            ])
+            remaining = deadline - time.monotonic()
+            if self._irq.wait_for_active(timeout=min(self.IRQ_REARM_INTERVAL, max(remaining, 0))):
+                return True
+            if remaining <= self.IRQ_REARM_INTERVAL:
+                return False
+
     def MFRC522_Request(self, reqMode: int) -> Tuple[int, int]:
         """Request a tag."""
         self.Write_MFRC522(self.BitFramingReg, 0x07)
-        status, backData, backBits = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, [reqMode])
+        status, backData, backBits = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, bytes((reqMode,)))
 
         if status != RFIDStatus.OK or backBits != 0x10:
             status = RFIDStatus.ERROR
 
         return status, backBits
 
-    def MFRC522_Anticoll(self) -> Tuple[int, List[int]]:
+    def MFRC522_Anticoll(self) -> Tuple[int, bytes]:
         """Anti-collision detection."""
         self.Write_MFRC522(self.BitFramingReg, 0x00)
-        status, backData, backBits = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, [self.PICC_ANTICOLL, 0x20])
+        status, backData, backBits = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, bytes((self.PICC_ANTICOLL, 0x20)))
 
+        # The fifth byte is the BCC: the XOR of the four UID bytes
         if status == RFIDStatus.OK and len(backData) == 5:
-            serNumCheck = 0
-            for i in range(4):
-                serNumCheck ^= backData[i]
-            if serNumCheck != backData[4]:
+            if reduce(operator.xor, backData[:4]) != backData[4]:
                 status = RFIDStatus.ERROR
 
         return status, backData
 
-    def CalculateCRC(self, data: List[int]) -> List[int]:
-        """Calculate CRC."""
-        self.ClearBitMask(self.DivIrqReg, 0x04)
-        self.SetBitMask(self.FIFOLevelReg, 0x80)
-
-        for byte in data:
-            self.Write_MFRC522(self.FIFODataReg, byte)
-
-        self.Write_MFRC522(self.CommandReg, self.PCD_CALCCRC)
+    def CalculateCRC(self, data: bytes) -> bytes:
+        """Calculate CRC on the chip.
+
+        Frames are checksummed on the host with crc_a; this is kept for
+        verifying the host implementation against the hardware.
+        """
+        # Clear CRCIrq, flush the FIFO, load the data and start the CRC
+        # coprocessor in one ioctl. DivIrqReg and FIFOLevelReg only act on the
+        # bits written as 1, so no read-modify-write is needed.
+        self._xfer_chain([
+            bytes((self.WRITE_ADDR[self.DivIrqReg], 0x04)),
+            bytes((self.WRITE_ADDR[self.FIFOLevelReg], 0x80)),
+            bytes((self.WRITE_ADDR[self.FIFODataReg],)) + bytes(data),
+            bytes((self.WRITE_ADDR[self.CommandReg], self.PCD_CALCCRC)),
+        ])
 
         for _ in range(0xFF):
             n = self.Read_MFRC522(self.DivIrqReg)
             if n & 0x04:
                 break
 
-        return [self.Read_MFRC522(self.CRCResultRegL), self.Read_MFRC522(self.CRCResultRegM)]
+        return bytes((self.Read_MFRC522(self.CRCResultRegL), self.Read_MFRC522(self.CRCResultRegM)))
 
-    def MFRC522_SelectTag(self, serNum: List[int]) -> int:
+    def MFRC522_SelectTag(self, serNum: bytes) -> int:
         """Select a tag."""
-        buf = [self.PICC_SELECTTAG, 0x70] + serNum
-        buf += self.CalculateCRC(buf)
+        buf = bytes((self.PICC_SELECTTAG, 0x70)) + bytes(serNum)
+        buf += crc_a(buf)
         status, backData, backLen = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, buf)
 
         if status == RFIDStatus.OK and backLen == 0x18:
-            logger.info("Size: %s", backData[0])
+            logger.debug("Size: %s", backData[0])
             return backData[0]
         return 0
 
-    def MFRC522_Auth(self, authMode: int, blockAddr: int, sectorKey: List[int], serNum: List[int]) -> int:
+    def MFRC522_Auth(self, authMode: int, blockAddr: int, sectorKey: bytes, serNum: bytes) -> int:
         """Authenticate a tag."""
-        buff = [authMode, blockAddr] + sectorKey + serNum
+        buff = bytes((authMode, blockAddr)) + bytes(sectorKey) + bytes(serNum)
         status, backData, backLen = self.MFRC522_ToCard(self.PCD_AUTHENT, buff)
 
         if status != RFIDStatus.OK or not (self.Read_MFRC522(self.Status2Reg) & 0x08):
@@ -374,21 +634,27 @@ class MFRC522:
 
     def MFRC522_Read(self, blockAddr: int) -> None:
         """Read data from a block."""
-        recvData = [self.PICC_READ, blockAddr] + self.CalculateCRC([self.PICC_READ, blockAddr])
+        recvData = bytes((self.PICC_READ, blockAddr))
+        recvData += crc_a(recvData)
         status, backData, backLen = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, recvData)
 
         if status == RFIDStatus.OK and len(backData) == 16:
-            logger.info("Sector %s %s", blockAddr, backData)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Sector %s %s", blockAddr, backData.hex(" "))
         else:
             logger.error("Error while reading!")
 
-    def MFRC522_Write(self, blockAddr: int, writeData: List[int]) -> None:
+    def MFRC522_Write(self, blockAddr: int, writeData: bytes) -> None:
         """Write data to a block."""
-        buff = [self.PICC_WRITE, blockAddr] + self.CalculateCRC([self.PICC_WRITE, blockAddr])
+        if len(writeData) != 16:
+            raise ValueError(f"MIFARE blocks are 16 bytes, got {len(writeData)}")
+        buff = bytes((self.PICC_WRITE, blockAddr))
+        buff += crc_a(buff)
         status, backData, backLen = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, buff)
 
         if status == RFIDStatus.OK and backLen == 4 and (backData[0] & 0x0F) == 0x0A:
-            buf = writeData + self.CalculateCRC(writeData)
+            buf = bytes(writeData)
+            buf += crc_a(buf)
             status, backData, backLen = self.MFRC522_ToCard(self.PCD_TRANSCEIVE, buf)
             if status == RFIDStatus.OK and backLen == 4 and (backData[0] & 0x0F) == 0x0A:
                 logger.info("Data written")
@@ -402,13 +668,16 @@ class MFRC522:
         # GPIO.output(self.NRSTPD, 1)
         self.MFRC522_Reset()
 
-        self.Write_MFRC522(self.TModeReg, 0x8D)
-        self.Write_MFRC522(self.TPrescalerReg, 0x3E)
-        self.Write_MFRC522(self.TReloadRegL, 30)
-        self.Write_MFRC522(self.TReloadRegH, 0)
-
-        self.Write_MFRC522(self.TxAutoReg, 0x40)
-        self.Write_MFRC522(self.ModeReg, 0x3D)
+        # Each register needs its own CS frame, so the setup is one ioctl
+        # chain rather than one transfer
+        self._write_regs([
+            (self.TModeReg, 0x8D),
+            (self.TPrescalerReg, 0x3E),
+            (self.TReloadRegL, 30),
+            (self.TReloadRegH, 0),
+            (self.TxAutoReg, 0x40),
+            (self.ModeReg, 0x3D),
+        ])
         self.AntennaOn()
 
     def GPIO_CLEAN(self) -> None:
@@ -422,14 +691,63 @@ class MFRC522:
 class RFIDReader:
     """High-level interface for RFID operations."""
 
-    def __init__(self, spd: int = 1000000) -> None:
+    def __init__(self, spd: int = 8000000, irq_pin: Optional[int] = None) -> None:
         """Initialize the RFID reader."""
-        if IS_RASPBERRY_PI:
-            self.rfid = MFRC522(spd)
+        if use_rfid_hardware():
+            self.rfid = MFRC522(spd, irq_pin)
         else:
-            self.rfid = MockMFRC522(spd)
+            self.rfid = MockMFRC522(spd, irq_pin)
+        # UIDs read by the background poller, see start_polling()
+        self._uid_queue: "queue.Queue[bytes]" = queue.Queue(maxsize=8)
+        self._poll_thread: Optional[threading.Thread] = None
+        self._stop_polling = threading.Event()
+
+    def start_polling(self, interval: float = 1.0) -> "queue.Queue[bytes]":
+        """Read cards on a background thread and return the queue their UIDs are put on.
+
+        The caller can authenticate or act on one card while the next is
+        being read. interval bounds each wait for a card and is also the
+        pause after a read, so a card held on the reader is not reported
+        continuously.
+        """
+        if self._poll_thread is None:
+            self._stop_polling.clear()
+            self._poll_thread = threading.Thread(target=self._poll_loop, args=(interval,),
+                                                 name="RFIDPoller", daemon=True)
+            self._poll_thread.start()
+        return self._uid_queue
+
+    def stop_polling(self) -> None:
+        """Stop the background poller started by start_polling()."""
+        if self._poll_thread is not None:
+            self._stop_polling.set()
+            self._poll_thread.join()
+            self._poll_thread = None
+
+    def _poll_loop(self, interval: float) -> None:
+        """Wait for cards and queue the UID of each one read."""
+        while not self._stop_polling.is_set():
+            if not self.wait_for_card(interval):
+                continue
+            status, uid = self.read_card()
+            if status != RFIDStatus.OK:
+                continue
+            try:
+                self._uid_queue.put_nowait(uid)
+            except queue.Full:
+                logger.warning("RFID UID queue full, dropping card read")
+            self._stop_polling.wait(interval)
+
+    def wait_for_card(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a card; True means read_card is worth calling."""
+        try:
+            return self.rfid.wait_for_tag(timeout)
+        except Exception as e:
+            logger.error("Error waiting for card: %s", e)
+            time.sleep(timeout)
+            return True
 
-    def read_card(self) -> Tuple[int, List[int]]:
+    def read_card(self) -> Tuple[int, bytes]:
         """Read the ID of an RFID card."""
         try:
             status, tag_type = self.rfid.MFRC522_Request(self.rfid.PICC_REQIDL)
@@ -437,20 +755,19 @@ class RFIDReader:
                 status, uid = self.rfid.MFRC522_Anticoll()
                 if status == RFIDStatus.OK:
                     return status, uid
-            return status, []
+            return status, b""
         except Exception as e:
             logger.error("Error reading card: %s", e)
-            return RFIDStatus.ERROR, []
+            return RFIDStatus.ERROR, b""
 
-    def authenticate_card(self, uid: List[int]) -> Tuple[int, Optional[str]]:
+    def authenticate_card(self, uid: bytes) -> Tuple[int, Optional[str]]:
         """Authenticate an RFID card based on its UID."""
         try:
             if len(uid) != 5:
                 logger.warning("Invalid UID length: %d", len(uid))
                 return RFIDStatus.ERROR, None
 
-            card_uid_tuple: Tuple[int, int, int, int, int] = (uid[0], uid[1], uid[2], uid[3], uid[4])
-            card_info = AUTHORIZED_CARDS.get(card_uid_tuple)
+            card_info = AUTHORIZED_CARDS.get(bytes(uid))
 
             if card_info:
                 logger.info("Card authenticated: %s (%s)", card_info.name, card_info.role)
@@ -471,7 +788,7 @@ class RFIDReader:
             logger.error("Error reading card data: %s", e)
             return False
 
-    def write_card_data(self, block_addr: int, data: List[int]) -> bool:
+    def write_card_data(self, block_addr: int, data: bytes) -> bool:
         """Write data to a block on the RFID card."""
         try:
             self.rfid.MFRC522_Write(block_addr, data)
@@ -483,24 +800,25 @@ class RFIDReader:
     def cleanup(self) -> None:
         """Clean up the GPIO pins."""
         try:
+            self.stop_polling()
             self.rfid.GPIO_CLEAN()
             logger.info("GPIO cleanup completed")
         except Exception as e:
             logger.error("Error during GPIO cleanup: %s", e)
 
 if __name__ == "__main__":
-    rfid_reader = RFIDReader()
+    irq_pin = os.getenv("RFID_IRQ_PIN")
+    rfid_reader = RFIDReader(irq_pin=int(irq_pin) if irq_pin else None)
     try:
+        uids = rfid_reader.start_polling(1.0)
         while True:
-            status, uid = rfid_reader.read_card()
+            uid = uids.get()
+            logger.info("Card detected: %s", list(uid))
+            status, role = rfid_reader.authenticate_card(uid)
             if status == RFIDStatus.OK:
-                logger.info("Card detected: %s", uid)
-                status, role = rfid_reader.authenticate_card(uid)
-                if status == RFIDStatus.OK:
-                    logger.info("Authenticated as: %s", role)
-                else:
-                    logger.error("Authentication failed")
-            time.sleep(1)
+                logger.info("Authenticated as: %s", role)
+            else:
+                logger.error("Authentication failed")
     except KeyboardInterrupt:
         rfid_reader.cleanup()
         logger.info("Exiting...")
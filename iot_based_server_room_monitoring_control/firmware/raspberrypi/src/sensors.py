@@ -8,15 +8,16 @@ It provides a unified interface for sensor management, event handling, and statu
 import time
 import logging
 import datetime
+import queue
 import threading
 import os
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple, Any
 import RPi.GPIO as GPIO
 from .motion import MotionSensorHandler, DoorSensorHandler, WindowSensorHandler, SensorConfig
 from .rfid import RFIDReader, RFIDStatus, CardInfo
 from .camera import CameraManager, CameraConfig
-from .notifications import NotificationManager, create_intrusion_alert, create_rfid_alert
+from .notifications import get_notification_manager, create_intrusion_alert, create_rfid_alert
 
 # Configure logging
 logging.basicConfig(
@@ -25,18 +26,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _isoformat_ns(timestamp_ns: int) -> str:
+    """Format a time.time_ns() timestamp as a local ISO 8601 string."""
+    return datetime.datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
 @dataclass
 class SensorStatus:
     """Status information for a sensor."""
     name: str
     is_active: bool
-    last_check: datetime.datetime
+    last_check_ns: int # time.time_ns(); formatted only in to_dict()
     type: str # Made non-optional: motion, door, window, rfid, camera, door_lock, door_unlcok, window_lock, window_unlock etc.
     location: Optional[str] = None # e.g., 'main_door', 'rack_window'
     error: Optional[str] = None
     data: Optional[Dict[str, Any]] = None
     firmware_version: Optional[str] = None # Can be added if sensors have firmware
-    last_event_timestamp: Optional[datetime.datetime] = None # Renamed for clarity
+    last_event_ns: Optional[int] = None # time.time_ns() of the last event
     event_count: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
@@ -44,29 +49,50 @@ class SensorStatus:
         return {
             "name": self.name,
             "is_active": self.is_active,
-            "last_check": self.last_check.isoformat(),
+            "last_check": _isoformat_ns(self.last_check_ns),
             "error": self.error,
             "data": self.data,
             "location": self.location,
             "type": self.type,
             "firmware_version": self.firmware_version,
-            "last_event_timestamp": self.last_event_timestamp.isoformat() if self.last_event_timestamp else None,
+            "last_event_timestamp": _isoformat_ns(self.last_event_ns) if self.last_event_ns else None,
             "event_count": self.event_count
         }
 
 class SensorManager:
     """Manages all sensors and provides unified monitoring interface."""
 
+    # Edge-triggered GPIO sensors: data key for the state, intrusion event type and message
+    GPIO_EVENTS = {
+        'motion': ('detected', "motion_detected", "Motion detected in server room"),
+        'door': ('open', "door_opened", "Door opened in server room"),
+        'window': ('open', "window_opened", "Window opened in server room"),
+    }
+    # Seconds between status refreshes of the GPIO sensors while no edge arrives
+    GPIO_REFRESH_INTERVAL = 1.0
+    # Captures waiting for the camera beyond this many are dropped
+    CAPTURE_QUEUE_SIZE = 16
+    # Unauthorized-card captures allowed per event cooldown across all UIDs
+    UNAUTHORIZED_ALERTS_PER_COOLDOWN = 3
+
     def __init__(self, camera_config: Optional[CameraConfig] = None, verbose: bool = False):
         """Initialize the sensor manager with all sensors."""
         self.verbose = verbose
+        # Serialises writers only. Entries in _sensor_status are replaced, never
+        # mutated, so get_sensor_status() can read them without the lock.
         self._lock = threading.Lock()
         self._threads: List[threading.Thread] = []
         self._sensor_status: Dict[str, SensorStatus] = {}
-        self._last_event_time = datetime.datetime.now() - datetime.timedelta(seconds=300) # Initialize to allow immediate event
+        self._last_event_times: Dict[str, float] = {} # Monotonic time of the last handled event, per event key
+        self._event_times_lock = threading.Lock()
         self._event_cooldown = int(os.getenv("EVENT_COOLDOWN", "300")) # Cooldown in seconds
         self._running = True
-        self._notification_manager = NotificationManager()
+        self._notification_manager = get_notification_manager()
+        # Names of GPIO sensors that triggered, put by the gpiozero callbacks
+        self._gpio_events: "queue.Queue[str]" = queue.Queue()
+        # Media captures and alerts, run by the capture worker so detection never waits on the camera
+        self._capture_queue: "queue.Queue[Tuple[Callable[..., None], Tuple[Any, ...]]]" = queue.Queue(self.CAPTURE_QUEUE_SIZE)
+        self._dropped_captures = 0
 
         # Initialize sensors with proper configuration
         try:
@@ -103,8 +129,18 @@ class SensorManager:
             self._window_sensor = WindowSensorHandler(window_config)
             self._initialize_sensor_status('window', type='window', location=f'pin_{window_pin}')
 
-            # RFID reader initialization
-            self._rfid_reader = RFIDReader()
+            self._gpio_readers = {
+                'motion': self._motion_sensor.check_motion,
+                'door': self._door_sensor.check_state,
+                'window': self._window_sensor.check_state,
+            }
+            self._motion_sensor.on_trigger = lambda: self._gpio_events.put_nowait('motion')
+            self._door_sensor.on_trigger = lambda: self._gpio_events.put_nowait('door')
+            self._window_sensor.on_trigger = lambda: self._gpio_events.put_nowait('window')
+
+            # RFID reader initialization; with an IRQ pin the reader thread sleeps until a card answers
+            rfid_irq_pin = os.getenv("RFID_IRQ_PIN")
+            self._rfid_reader = RFIDReader(irq_pin=int(rfid_irq_pin) if rfid_irq_pin else None)
             self._initialize_sensor_status('rfid', type='rfid', location='main_reader')
 
             # Camera initialization - Pass the config if provided
@@ -133,26 +169,25 @@ class SensorManager:
                      type=type,
                      location=location,
                      is_active=False, # Will be set to True once checks start
-                     last_check=datetime.datetime.now(),
+                     last_check_ns=time.time_ns(),
                      event_count=0,
-                     last_event_timestamp=None
+                     last_event_ns=None
                  )
 
     # Update method to preserve existing static info and update counts/timestamps
     def _update_sensor_status(self, sensor_name: str, is_active: bool, error: Optional[str] = None, data: Optional[Dict[str, Any]] = None, event_detected: bool = False) -> None:
         """Update the status of a sensor, incrementing event count if needed."""
-        now = datetime.datetime.now()
+        now = time.time_ns()
         with self._lock:
-            if sensor_name in self._sensor_status:
-                current_status = self._sensor_status[sensor_name]
-                current_status.is_active = is_active
-                current_status.last_check = now
-                current_status.error = error
-                current_status.data = data
-
+            current_status = self._sensor_status.get(sensor_name)
+            if current_status is not None:
                 if event_detected:
-                     current_status.event_count += 1
-                     current_status.last_event_timestamp = now
+                    self._sensor_status[sensor_name] = replace(
+                        current_status, is_active=is_active, last_check_ns=now, error=error, data=data,
+                        event_count=current_status.event_count + 1, last_event_ns=now)
+                else:
+                    self._sensor_status[sensor_name] = replace(
+                        current_status, is_active=is_active, last_check_ns=now, error=error, data=data)
             else:
                 # Should not happen if initialized correctly, but handle defensively
                 logger.warning(f"Attempted to update status for uninitialized sensor: {sensor_name}. Creating entry.")
@@ -171,73 +206,52 @@ class SensorManager:
                 self._sensor_status[sensor_name] = SensorStatus(
                     name=sensor_name,
                     is_active=is_active,
-                    last_check=now,
+                    last_check_ns=now,
                     error=error,
                     data=data,
                     type=fallback_type,
                     location=fallback_location,
                     event_count=1 if event_detected else 0,
-                    last_event_timestamp=now if event_detected else None
+                    last_event_ns=now if event_detected else None
                 )
 
-    def _handle_motion(self) -> None:
-        """Handle motion sensor events."""
-        while self._running:
-            try:
-                motion_detected = self._motion_sensor.check_motion()
-                self._update_sensor_status('motion', True, data={'detected': motion_detected})
-
-                if motion_detected:
-                    logger.info("Motion detected in server room")
-                    self._update_sensor_status('motion', True, data={'detected': True}, event_detected=True)
-                    self._handle_intrusion_event("motion_detected", "Motion detected in server room")
-
-                time.sleep(1)
-            except Exception as e:
-                self._update_sensor_status('motion', False, str(e))
-                logger.error("Motion sensor error: %s", e)
-                time.sleep(5)
-
-    def _handle_door(self) -> None:
-        """Handle door sensor events."""
-        while self._running:
-            try:
-                door_open = self._door_sensor.check_state()
-                self._update_sensor_status('door', True, data={'open': door_open})
-
-                if door_open:
-                    logger.info("Door opened in server room")
-                    self._update_sensor_status('door', True, data={'open': True}, event_detected=True)
-                    self._handle_intrusion_event("door_opened", "Door opened in server room")
-
-                time.sleep(1)
-            except Exception as e:
-                self._update_sensor_status('door', False, str(e))
-                logger.error("Door sensor error: %s", e)
-                time.sleep(5)
+    def _handle_gpio_events(self) -> None:
+        """Handle motion, door and window events signalled by the GPIO edge callbacks.
 
-    def _handle_window(self) -> None:
-        """Handle window sensor events."""
+        The thread sleeps until a sensor triggers; while none does, it wakes
+        every GPIO_REFRESH_INTERVAL seconds only to refresh their status.
+        """
         while self._running:
             try:
-                window_open = self._window_sensor.check_state()
-                self._update_sensor_status('window', True, data={'open': window_open})
-
-                if window_open:
-                    logger.info("Window opened in server room")
-                    self._update_sensor_status('window', True, data={'open': True}, event_detected=True)
-                    self._handle_intrusion_event("window_opened", "Window opened in server room")
-
-                time.sleep(1)
-            except Exception as e:
-                self._update_sensor_status('window', False, str(e))
-                logger.error("Window sensor error: %s", e)
-                time.sleep(5)
+                sensor_name = self._gpio_events.get(timeout=self.GPIO_REFRESH_INTERVAL)
+            except queue.Empty:
+                for name in self._gpio_readers:
+                    self._refresh_gpio_status(name)
+                continue
+
+            # The edge itself is the event; the pin may have settled back by now
+            key, event_type, message = self.GPIO_EVENTS[sensor_name]
+            logger.info(message)
+            self._update_sensor_status(sensor_name, True, data={key: True}, event_detected=True)
+            self._handle_intrusion_event(event_type, message)
+
+    def _refresh_gpio_status(self, name: str) -> None:
+        """Read a GPIO sensor and record its current state."""
+        try:
+            state = self._gpio_readers[name]()
+        except Exception as e:
+            self._update_sensor_status(name, False, str(e))
+            logger.error("%s sensor error: %s", name.capitalize(), e)
+            return
+        self._update_sensor_status(name, True, data={self.GPIO_EVENTS[name][0]: state})
 
     def _handle_rfid(self) -> None:
         """Handle RFID events."""
         while self._running:
             try:
+                # Bounded wait so the thread notices stop() within a second
+                if not self._rfid_reader.wait_for_card(1.0):
+                    continue
                 status, uid = self._rfid_reader.read_card()
 
                 if status == RFIDStatus.OK:
@@ -256,19 +270,68 @@ class SensorManager:
                         logger.warning("Unauthorized RFID access: %s", uid_str)
                         self._handle_unauthorized_access(uid_str)
 
-                time.sleep(60)  # Check RFID every 60 seconds
+                    time.sleep(1)  # Don't report a card held on the reader continuously
             except Exception as e:
                 self._update_sensor_status('rfid', False, str(e))
                 logger.error("RFID error: %s", e)
                 time.sleep(5)
 
+    def _claim_event(self, event_key: str, prefix_limit: Optional[Tuple[str, int]] = None) -> bool:
+        """Start the cooldown for event_key, unless it is already cooling down.
+
+        With prefix_limit (prefix, n), the claim also fails while n keys with
+        that prefix are cooling down, capping the rate of a whole event type.
+        Expired keys are evicted on each claim, so per-UID keys don't pile up.
+        """
+        now = time.monotonic()
+        with self._event_times_lock:
+            times = self._last_event_times
+            for key in [key for key, last in times.items() if now - last >= self._event_cooldown]:
+                del times[key]
+            if event_key in times:
+                return False
+            if prefix_limit is not None:
+                prefix, limit = prefix_limit
+                if sum(1 for key in times if key.startswith(prefix)) >= limit:
+                    return False
+            times[event_key] = now
+            return True
+
+    def _release_event(self, event_key: str) -> None:
+        """End the cooldown for event_key early, so the next occurrence is handled."""
+        with self._event_times_lock:
+            self._last_event_times.pop(event_key, None)
+
+    def _queue_capture(self, event_key: str, capture: Callable[..., None], *args: Any) -> None:
+        """Hand a media capture to the capture worker, dropping it if the queue is full."""
+        try:
+            self._capture_queue.put_nowait((capture, (event_key,) + args))
+        except queue.Full:
+            self._dropped_captures += 1
+            # Let the next occurrence of this event try again
+            self._release_event(event_key)
+            logger.warning("Capture queue full, dropping %s (%d dropped so far)", event_key, self._dropped_captures)
+
+    def _handle_captures(self) -> None:
+        """Run queued media captures and alerts one at a time; captures still queued at stop are dropped."""
+        while self._running:
+            try:
+                capture, args = self._capture_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            capture(*args)
+
     def _handle_intrusion_event(self, event_type: str, message: str) -> None:
-        """Handle intrusion events by capturing media and sending notifications."""
-        current_time = datetime.datetime.now()
-        if (current_time - self._last_event_time).total_seconds() < self._event_cooldown:
-            logger.debug("Intrusion event cooldown active, skipping media capture")
+        """Handle intrusion events by queueing a media capture and notification."""
+        event_key = f"{event_type}|{message}"
+        # Claimed now, so repeats are not queued while this capture waits
+        if not self._claim_event(event_key):
+            logger.debug("Intrusion event cooldown active for %s, skipping media capture", event_type)
             return
+        self._queue_capture(event_key, self._capture_intrusion, event_type, message)
 
+    def _capture_intrusion(self, event_key: str, event_type: str, message: str) -> None:
+        """Capture media for an intrusion event and send the alert."""
         try:
             # Capture image and video
             image_path, image_url = self._camera.capture_image()
@@ -297,18 +360,22 @@ class SensorManager:
             self._notification_manager.send_alert(alert)
 
             logger.warning("Intrusion detected! Media captured: %s, %s", image_path, video_path)
-            self._last_event_time = current_time
         except Exception as e:
+            self._release_event(event_key)
             self._update_sensor_status('camera', False, str(e))
             logger.error("Failed to handle intrusion event: %s", e)
 
     def _handle_unauthorized_access(self, uid: str) -> None:
-        """Handle unauthorized access events."""
-        current_time = datetime.datetime.now()
-        if (current_time - self._last_event_time).total_seconds() < self._event_cooldown:
-            logger.debug("Unauthorized access event cooldown active, skipping media capture")
+        """Handle unauthorized access events by queueing a media capture and notification."""
+        event_key = f"unauthorized_access|{uid}"
+        # Per UID, and at most UNAUTHORIZED_ALERTS_PER_COOLDOWN distinct cards per cooldown
+        if not self._claim_event(event_key, ("unauthorized_access|", self.UNAUTHORIZED_ALERTS_PER_COOLDOWN)):
+            logger.debug("Unauthorized access event cooldown active for %s, skipping media capture", uid)
             return
+        self._queue_capture(event_key, self._capture_unauthorized_access, uid)
 
+    def _capture_unauthorized_access(self, event_key: str, uid: str) -> None:
+        """Capture media for an unauthorized card and send the alert."""
         try:
             # Capture image and video
             image_path, image_url = self._camera.capture_image()
@@ -334,18 +401,18 @@ class SensorManager:
             self._notification_manager.send_alert(alert)
 
             logger.warning("Unauthorized access! Media captured: %s, %s", image_path, video_path)
-            self._last_event_time = current_time
         except Exception as e:
+            self._release_event(event_key)
             self._update_sensor_status('camera', False, str(e))
             logger.error("Failed to handle unauthorized access event: %s", e)
 
     def get_sensor_status(self) -> Dict[str, Any]:
         """Get the current status of all sensors."""
-        with self._lock:
-            return {
-                name: status.to_dict()
-                for name, status in self._sensor_status.items()
-            }
+        # Copying the dict is atomic under the GIL and each entry is an immutable snapshot
+        return {
+            name: status.to_dict()
+            for name, status in self._sensor_status.copy().items()
+        }
 
     def start(self) -> None:
         """Start all sensor monitoring threads."""
@@ -355,9 +422,8 @@ class SensorManager:
 
         self._running = True
         self._threads = [
-            threading.Thread(target=self._handle_motion, name="MotionThread"),
-            threading.Thread(target=self._handle_door, name="DoorThread"),
-            threading.Thread(target=self._handle_window, name="WindowThread"),
+            threading.Thread(target=self._handle_gpio_events, name="GPIOEventThread"),
+            threading.Thread(target=self._handle_captures, name="CaptureThread"),
             threading.Thread(target=self._handle_rfid, name="RFIDThread")
         ]
 
@@ -277,6 +277,30 @@ async def receive_pi_event(
             detail="Failed to receive event"
         )
 
+@router.post("/events/batch", status_code=status.HTTP_201_CREATED)
+async def receive_pi_events(
+    request: Request,
+    events: List[RaspberryPiEvent],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    POST /events/batch endpoint for Raspberry Pi to send several events at once.
+    Accepts a JSON array of events. Requires API Key authentication.
+    """
+    try:
+        for event in events:
+            background_tasks.add_task(process_pi_event, db, event)
+        logger.info(f"Received batch of {len(events)} event(s) from Pi. Processing in background.")
+        return {"message": "Events received successfully and queued for processing", "count": len(events)}
+    except Exception as e:
+        logger.error(f"Error receiving event batch from Pi: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to receive events"
+        )
+
 @router.get("/sensors/{sensor_type}", response_model=Dict[str, Any])
 @rate_limit(requests=RATE_LIMIT_REQUESTS, window=RATE_LIMIT_WINDOW)
 async def get_sensor_data(
@@ -40,3 +40,28 @@ def test_manual_control_invalid():
     assert response.status_code == 400
     data = response.json()
     assert "detail" in data
+
+def test_receive_pi_event_batch():
+    # Bypass API key validation; the batch endpoint uses the same dependency as /events
+    from app.auth import get_api_key
+    app.dependency_overrides[get_api_key] = lambda: "test-key"
+    try:
+        events = [
+            {
+                "event_type": "motion_detected",
+                "message": "Motion detected in server room",
+                "timestamp": "2025-03-13T21:00:00",
+                "severity": "warning"
+            },
+            {
+                "event_type": "door_opened",
+                "message": "Server room door opened",
+                "timestamp": "2025-03-13T21:00:01"
+            }
+        ]
+        response = client.post("/api/v1/events/batch", json=events)
+        assert response.status_code == 201
+        data = response.json()
+        assert data["count"] == 2
+    finally:
+        app.dependency_overrides.pop(get_api_key, None)
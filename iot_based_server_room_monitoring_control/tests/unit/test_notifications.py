@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "firmware" / "raspberrypi"))
+notifications = pytest.importorskip("src.notifications")
+
+
+def test_close_sends_enqueued_alert_after_executors_shut_down():
+    manager = notifications.NotificationManager(notifications.NotificationConfig(send_timeout=5.0))
+    sent = []
+    manager._dispatch["sms"] = lambda alert, body=None: sent.append(alert) or True
+    manager._active_channels = ("sms",)
+    # What concurrent.futures' exit hook does to every pool at interpreter shutdown
+    for executor in (manager._executor, manager._sms_executor, manager._fcm_executor):
+        executor.shutdown(wait=True)
+
+    alert = notifications.create_intrusion_alert("door_opened", "Door opened after hours")
+    manager.enqueue(alert)
+    manager.close()
+
+    assert sent == [alert]
+    assert manager._alert_queue.unfinished_tasks == 0